@@ -1,7 +1,10 @@
 from PyQt6.QtWidgets import QApplication
 from go import Go
+import logging
 import sys
 
+logging.basicConfig(format="%(message)s")
+logging.getLogger("engine").setLevel(logging.DEBUG)  # Show the game logic's debug output
 app = QApplication([])
 myGo = Go()
 sys.exit(app.exec())
\ No newline at end of file
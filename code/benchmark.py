@@ -0,0 +1,91 @@
+"""
+Measure the per-move cost of GoGame across board sizes.
+Run from the code directory: python benchmark.py (needs only the engine package, not PyQt6)
+"""
+import random
+import time
+
+from engine import GoGame
+
+SIZES = (9, 13, 19, 25, 37, 52)
+
+
+def random_game_cost(size, attempts=5000, seed=0):
+    """
+    Time random move attempts, size * size per game, so that every board size
+    reaches a similar fill with captures along the way.
+    :return: Microseconds per place_stone call.
+    """
+    rng = random.Random(seed)
+    elapsed = 0.0
+    done = 0
+    while done < attempts:
+        game = GoGame(size)
+        moves = [(rng.randrange(size), rng.randrange(size)) for _ in range(size * size)]
+        start = time.perf_counter()
+        for row, col in moves:
+            game.place_stone(row, col)
+        elapsed += time.perf_counter() - start
+        done += len(moves)
+    return elapsed / done * 1e6
+
+
+def snake_cost(size, repeats=200):
+    """
+    Build one Black chain snaking over every other row, then time a White move next
+    to it and its undo. The old recursive liberty count hit the recursion limit on
+    this shape at 52x52.
+    :return: (stones in the snake, microseconds per move).
+    """
+    game = GoGame(size)
+    for row in range(0, size, 2):
+        for col in range(size):
+            game.place_stone(row, col)
+            game.pass_turn()
+        link = size - 1 if row % 4 == 0 else 0
+        if row + 2 < size:
+            game.place_stone(row + 1, link)
+            game.pass_turn()
+    game.undo()  # Take back White's last pass so that White is to move
+    stones = len(game.get_chain(0, 0))
+    target = (1, 1) if size % 4 != 1 else (1, 2)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        game.place_stone(*target)
+        game.undo()
+    elapsed = time.perf_counter() - start
+    return stones, elapsed / repeats * 1e6
+
+
+def playout_cost(size, playouts=20, seed=0):
+    """
+    Time random playouts (GoGame.playout) from the empty board.
+    :return: (moves per playout, microseconds per move).
+    """
+    rng = random.Random(seed)
+    moves = 0
+    start = time.perf_counter()
+    for _ in range(playouts):
+        game = GoGame(size)
+        for point in game.playout(rng):
+            if point is not None:
+                moves += 1
+    elapsed = time.perf_counter() - start
+    return moves / playouts, elapsed / moves * 1e6
+
+
+def main():
+    print(f"{'size':>5} {'random move (us)':>17} {'snake stones':>13} {'move by snake (us)':>19}")
+    for size in SIZES:
+        per_move = random_game_cost(size)
+        stones, per_snake_move = snake_cost(size)
+        print(f"{size:>5} {per_move:>17.1f} {stones:>13} {per_snake_move:>19.1f}")
+    print()
+    print(f"{'size':>5} {'playout moves':>14} {'playout move (us)':>18}")
+    for size in SIZES[:3]:
+        length, per_move = playout_cost(size)
+        print(f"{size:>5} {length:>14.0f} {per_move:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
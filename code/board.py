@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import QFrame, QMessageBox, QSizePolicy
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QSize
 from PyQt6.QtGui import QPainter, QPixmap, QColor
+from engine import StonesAdded, StonesRemoved
 
 
 class Board(QFrame):
@@ -10,8 +11,6 @@ class Board(QFrame):
     updateCapturedStonesSignal = pyqtSignal(int, int)
     updateScoresSignal = pyqtSignal(dict)  # Signal for score updates
 
-    GRID_SIZE = 8  # Default to 7x7 board
-
     def __init__(self, parent=None, logic=None, score_board=None):
         super().__init__(parent)
         if logic is None:
@@ -19,10 +18,20 @@ class Board(QFrame):
         
         self.margin = 40
         self.logic = logic
+        self.GRID_SIZE = logic.board_size  # Number of lines, taken from the game logic
         self.hovered_cell = (-1, -1)
         self.remaining_time = 30
         self.score_board = score_board
 
+        # Stones to draw, kept up to date from the change events of the game logic
+        self.stones = {
+            (row, col): piece
+            for row, pieces in enumerate(logic.board_state)
+            for col, piece in enumerate(pieces)
+            if piece != 0
+        }
+        logic.subscribe(self.apply_changes)
+
         # Timer for game countdown
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.updateTimer)
@@ -111,22 +120,29 @@ class Board(QFrame):
             painter.drawEllipse(center_x - size // 2, center_y - size // 2, size, size)
             painter.setOpacity(1.0)  # Reset opacity
 
+    def apply_changes(self, events):
+        """Update the stones to draw from a batch of game logic change events."""
+        changed = False
+        for event in events:
+            if isinstance(event, StonesAdded):
+                for position in event.positions:
+                    self.stones[position] = event.color
+                changed = True
+            elif isinstance(event, StonesRemoved):
+                for position in event.positions:
+                    self.stones.pop(position, None)
+                changed = True
+        if changed:
+            self.update()
+
     def draw_stones(self, painter):
         """Draw the stones on the board based on the current game state."""
-        for row in range(self.GRID_SIZE):
-            for col in range(self.GRID_SIZE):
-                piece = self.logic.get_piece_at(row, col)
-                if piece == 1:
-                    stone = self.black_stone
-                elif piece == -1:
-                    stone = self.white_stone
-                else:
-                    continue
-
-                center_x = int(self.margin + col * self.square_width())
-                center_y = int(self.margin + row * self.square_height())
-                size = int(min(self.square_width(), self.square_height()) * 0.8)
-                painter.drawPixmap(center_x - size // 2, center_y - size // 2, size, size, stone)
+        size = int(min(self.square_width(), self.square_height()) * 0.8)
+        for (row, col), piece in self.stones.items():
+            stone = self.black_stone if piece == 1 else self.white_stone
+            center_x = int(self.margin + col * self.square_width())
+            center_y = int(self.margin + row * self.square_height())
+            painter.drawPixmap(center_x - size // 2, center_y - size // 2, size, size, stone)
 
     def mousePressEvent(self, event):
         grid_x = round((event.position().x() - self.margin) / self.square_width())
@@ -172,7 +188,7 @@ class Board(QFrame):
         self.update()
 
     def end_game(self):
-        scores = self.logic.calculate_scores()
+        scores = self.logic.calculate_scores(final=True)
         black_score = scores["black"]
         white_score = scores["white"]
 
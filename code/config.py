@@ -0,0 +1 @@
+BOARD_SIZE = 8  # Number of lines on each side of the board (5 to 52)
@@ -0,0 +1,19 @@
+"""
+Rules engine of the Go game: board, moves, scoring and analysis, in pure Python.
+Nothing in this package imports PyQt6; the user interface depends on it, never the
+other way round, so it can be used from worker processes and command line tools.
+The optional modules (ownership, bitboard and batch, which needs NumPy) are imported
+from their own modules.
+"""
+from .grid import EMPTY, BLACK, WHITE
+from .piece import Piece, Chain
+from .rules import (
+    AREA, TERRITORY, POSITIONAL, SITUATIONAL, RuleSet,
+    JAPANESE, CHINESE, AGA, NEW_ZEALAND, TROMP_TAYLOR, DEFAULT_RULES, RULE_SETS, get_rules,
+)
+from .persistent import Position, PersistentBoard, VariationNode
+from .game_logic import (
+    GoGame, MoveResult, PassAlive, Seki, handicap_points,
+    StonesAdded, StonesRemoved, PlayerChanged, ScoreChanged, KoChanged,
+    OUT_OF_BOUNDS, OCCUPIED, SUICIDE, KO, MIN_BOARD_SIZE, MAX_BOARD_SIZE,
+)
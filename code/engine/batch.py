@@ -0,0 +1,265 @@
+import numpy as np
+
+PASS = -1  # Move value for passing, moves are otherwise flat indices row * board_size + col
+
+
+def neighbor_any(mask):
+    """
+    Mark the points that have at least one orthogonal neighbor set in mask.
+    :param mask: Boolean array of shape (N, size, size).
+    :return: Boolean array of the same shape.
+    """
+    out = np.zeros_like(mask)
+    out[:, 1:, :] |= mask[:, :-1, :]
+    out[:, :-1, :] |= mask[:, 1:, :]
+    out[:, :, 1:] |= mask[:, :, :-1]
+    out[:, :, :-1] |= mask[:, :, 1:]
+    return out
+
+
+def neighbor_count(mask):
+    """
+    Count the orthogonal neighbors set in mask for every point.
+    :param mask: Boolean array of shape (N, size, size).
+    :return: int8 array of the same shape.
+    """
+    values = mask.astype(np.int8)
+    out = np.zeros_like(values)
+    out[:, 1:, :] += values[:, :-1, :]
+    out[:, :-1, :] += values[:, 1:, :]
+    out[:, :, 1:] += values[:, :, :-1]
+    out[:, :, :-1] += values[:, :, 1:]
+    return out
+
+
+def flood(seed, region):
+    """
+    Grow seed through orthogonally connected points of region on every board at once.
+    :param seed: Boolean array of starting points (must lie in region).
+    :param region: Boolean array of points the fill may spread through.
+    :return: Boolean array of the points of region connected to the seed.
+    """
+    while True:
+        grown = seed | (neighbor_any(seed) & region)
+        if np.array_equal(grown, seed):
+            return seed
+        seed = grown
+
+
+def alive_stones(stones, empty):
+    """
+    Find the stones of one color whose chain has at least one liberty.
+    :param stones: Boolean array of the stones of one color.
+    :param empty: Boolean array of empty points.
+    :return: Boolean array of stones in chains with a liberty.
+    """
+    return flood(stones & neighbor_any(empty), stones)
+
+
+def chain_liberties(stones, empty):
+    """
+    Count the liberties of the chain each stone belongs to.
+    Chains are labelled by propagating the smallest flat index through connected stones
+    (with pointer jumping), then every empty point adds one liberty to each distinct
+    chain label among its neighbors.
+    :param stones: Boolean array of the stones of one color, shape (N, size, size).
+    :param empty: Boolean array of empty points.
+    :return: int array with the liberty count of the chain at each stone, 0 elsewhere.
+    """
+    shape = stones.shape
+    total = stones.size
+    labels = np.where(stones, np.arange(total, dtype=np.int32).reshape(shape), total)
+    while True:
+        lowest = labels.copy()
+        np.minimum(lowest[:, 1:, :], labels[:, :-1, :], out=lowest[:, 1:, :])
+        np.minimum(lowest[:, :-1, :], labels[:, 1:, :], out=lowest[:, :-1, :])
+        np.minimum(lowest[:, :, 1:], labels[:, :, :-1], out=lowest[:, :, 1:])
+        np.minimum(lowest[:, :, :-1], labels[:, :, 1:], out=lowest[:, :, :-1])
+        lowest[~stones] = total
+        # Pointer jumping: follow each label to the label of the stone it names
+        flat = np.append(lowest.reshape(-1), total)
+        lowest = flat[flat[flat[:-1]]].reshape(shape)
+        if np.array_equal(lowest, labels):
+            break
+        labels = lowest
+
+    # Neighbor labels of every point (total where the neighbor is not a stone of this color)
+    padded = np.full((shape[0], shape[1] + 2, shape[2] + 2), total, dtype=np.int32)
+    padded[:, 1:-1, 1:-1] = labels
+    around = (padded[:, :-2, 1:-1], padded[:, 2:, 1:-1], padded[:, 1:-1, :-2], padded[:, 1:-1, 2:])
+    counted = []
+    for i, label in enumerate(around):
+        fresh = empty & (label != total)
+        for earlier in around[:i]:
+            fresh &= label != earlier  # Count a liberty once per chain
+        counted.append(label[fresh])
+    counts = np.bincount(np.concatenate(counted), minlength=total + 1)
+    counts[total] = 0
+    return counts[labels]
+
+
+class GoGameBatch:
+    def __init__(self, num_games, board_size, komi=6.5, max_moves=None):
+        """
+        Initialize N games that are stepped together with vectorized NumPy operations.
+        Boards are one int8 array of shape (N, size, size) using the GoGame values
+        (0 empty, 1 Black, -1 White). Ko is the simple ko rule and games are scored
+        by area (stones plus surrounded empty points).
+        :param num_games: Number of games N.
+        :param board_size: The size of the Go boards.
+        :param komi: Compensation points for the white player.
+        :param max_moves: Optional move limit after which a game is ended.
+        """
+        self.num_games = num_games
+        self.board_size = board_size
+        self.komi = komi
+        self.max_moves = max_moves
+        self.reset_game()
+
+    def reset_game(self):
+        """
+        Reset every game to an empty board with Black to move.
+        """
+        n = self.num_games
+        self.boards = np.zeros((n, self.board_size, self.board_size), dtype=np.int8)
+        self.current_player = np.ones(n, dtype=np.int8)  # 1 for Black, -1 for White
+        self.pass_count = np.zeros(n, dtype=np.int8)
+        self.move_count = np.zeros(n, dtype=np.int32)
+        self.captured_stones = {1: np.zeros(n, dtype=np.int32), -1: np.zeros(n, dtype=np.int32)}
+        self.ko_point = np.full(n, PASS, dtype=np.int32)  # Flat index banned by ko, PASS if none
+        self.active = np.ones(n, dtype=bool)  # Finished games stay in place but are masked out
+
+    def legal_moves(self):
+        """
+        Compute the legal points for the player to move in every game.
+        :return: Boolean array of shape (N, size, size); all False for finished games.
+        """
+        player = self.current_player[:, None, None]
+        empty = self.boards == 0
+        own = self.boards == player
+        opponent = self.boards == -player
+        own_liberties = chain_liberties(own, empty)
+        opponent_liberties = chain_liberties(opponent, empty)
+
+        legal = empty & (
+            neighbor_any(empty)
+            | neighbor_any(own_liberties >= 2)  # Connects to a chain that keeps a liberty
+            | neighbor_any(opponent_liberties == 1)  # Captures
+        )
+        legal &= self.active[:, None, None]
+        ko = np.nonzero(self.ko_point != PASS)[0]
+        legal.reshape(self.num_games, -1)[ko, self.ko_point[ko]] = False
+        return legal
+
+    def sample_moves(self, rng):
+        """
+        Pick a uniformly random legal move for every game, or PASS when there is none.
+        :param rng: numpy.random.Generator.
+        :return: int array of N flat move indices.
+        """
+        legal = self.legal_moves().reshape(self.num_games, -1)
+        weights = rng.random(legal.shape) * legal
+        moves = weights.argmax(axis=1).astype(np.int32)
+        moves[~legal.any(axis=1)] = PASS
+        return moves
+
+    def step(self, moves):
+        """
+        Apply one move per game. Finished games ignore their entry.
+        An illegal move leaves its game unchanged with the same player to move.
+        :param moves: Sequence of N flat move indices or PASS.
+        :return: Boolean array, True for games where the move was played.
+        """
+        n = self.num_games
+        games = np.arange(n)
+        moves = np.asarray(moves, dtype=np.int32)
+        flat = self.boards.reshape(n, -1)
+        player = self.current_player
+
+        passing = self.active & (moves == PASS)
+        target = np.where(moves == PASS, 0, moves)
+        playing = self.active & (moves != PASS)
+        playing &= (flat[games, target] == 0) & (target != self.ko_point)
+
+        before = self.boards.copy()
+        flat[games[playing], target[playing]] = player[playing]
+
+        # Remove opponent chains left without liberties
+        colors = player[:, None, None]
+        opponent = self.boards == -colors
+        dead = opponent & ~alive_stones(opponent, self.boards == 0)
+        self.boards[dead] = 0
+        captured = dead.sum(axis=(1, 2))
+
+        # A move that leaves its own chain without liberties is suicide
+        own = self.boards == colors
+        suicide = (own & ~alive_stones(own, self.boards == 0)).any(axis=(1, 2))
+        if suicide.any():
+            self.boards[suicide] = before[suicide]
+            captured[suicide] = 0
+            playing &= ~suicide
+
+        # Simple ko: a lone stone that captured exactly one stone and has that point as its only liberty
+        empty_count = neighbor_count(self.boards == 0).reshape(n, -1)[games, target]
+        friend_count = neighbor_count(own).reshape(n, -1)[games, target]
+        ko = playing & (captured == 1) & (empty_count == 1) & (friend_count == 0)
+        moved = playing | passing
+        self.ko_point[moved] = PASS  # Games whose move was rejected keep their ko ban
+        self.ko_point[ko] = dead.reshape(n, -1)[ko].argmax(axis=1)
+
+        self.captured_stones[1] += np.where(player == 1, captured, 0).astype(np.int32)
+        self.captured_stones[-1] += np.where(player == -1, captured, 0).astype(np.int32)
+
+        self.pass_count[playing] = 0
+        self.pass_count[passing] += 1
+        self.move_count[moved] += 1
+        self.current_player[moved] *= -1
+
+        finished = self.pass_count >= 2
+        if self.max_moves is not None:
+            finished |= self.move_count >= self.max_moves
+        self.active &= ~finished
+        return moved
+
+    def calculate_scores(self):
+        """
+        Area-score every game: stones plus empty regions reached by only one color.
+        :return: Dictionary of float arrays for black and white (komi included).
+        """
+        black = self.boards == 1
+        white = self.boards == -1
+        empty = self.boards == 0
+        black_reach = flood(neighbor_any(black) & empty, empty)
+        white_reach = flood(neighbor_any(white) & empty, empty)
+        black_area = (black | (black_reach & ~white_reach)).sum(axis=(1, 2))
+        white_area = (white | (white_reach & ~black_reach)).sum(axis=(1, 2))
+        return {"black": black_area.astype(float), "white": white_area + self.komi}
+
+    def results(self):
+        """
+        Report the outcome of every game.
+        :return: Dictionary with the scores, the winner (1 Black, -1 White, 0 draw),
+                 the margin for Black and whether each game has finished.
+        """
+        scores = self.calculate_scores()
+        margin = scores["black"] - scores["white"]
+        return {
+            "black": scores["black"],
+            "white": scores["white"],
+            "margin": margin,
+            "winner": np.sign(margin).astype(np.int8),
+            "finished": ~self.active,
+        }
+
+    def play_random(self, rng):
+        """
+        Play uniformly random legal moves in every game until all of them have finished.
+        Needs max_moves to be set, as random play does not reliably end in two passes.
+        :param rng: numpy.random.Generator.
+        :return: The results() of the finished games.
+        """
+        if self.max_moves is None:
+            raise ValueError("play_random requires a max_moves limit.")
+        while self.active.any():
+            self.step(self.sample_moves(rng))
+        return self.results()
@@ -0,0 +1,264 @@
+from .game_logic import StonesAdded, StonesRemoved, PlayerChanged, ScoreChanged
+
+
+class BitboardGoGame:
+    def __init__(self, board_size, komi=6.5):
+        """
+        Initialize a game whose board is stored as Python int bitmasks.
+        Offers the same interface as GoGame, so Board can use either one.
+        Each row takes board_size + 1 bits; the extra bit is always clear and stops
+        left/right shifts from wrapping into the next row.
+        :param board_size: The size of the Go board (e.g., 9 for a 9x9 board).
+        :param komi: Compensation points for the white player.
+        """
+        self.board_size = board_size
+        self.komi = komi
+        self.width = board_size + 1
+        row_mask = (1 << board_size) - 1
+        self.on_board = 0  # One bit set for every intersection
+        for row in range(board_size):
+            self.on_board |= row_mask << (row * self.width)
+        self.listeners = []  # Functions called with the change events, see subscribe()
+        self.reset_game()
+
+    def reset_game(self):
+        """
+        Reset the game state and initialize the board.
+        """
+        events = []
+        if self.listeners:
+            for color in (1, -1):
+                if self.stones[color]:
+                    events.append(StonesRemoved(tuple(self.positions(self.stones[color])), color))
+            if self.current_player != 1:
+                events.append(PlayerChanged(1))
+            if any(self.captured_stones.values()):
+                events.append(ScoreChanged((0, 0)))
+        self.stones = {1: 0, -1: 0}  # Bitmask of the stones of each color
+        self.current_player = 1  # Start with Black (1)
+        self.pass_count = 0
+        self.previous_states = set()  # (black, white) bitmask pairs of earlier positions (superko)
+        self.captured_stones = {1: 0, -1: 0}
+        self.publish(events)
+
+    @property
+    def board_state(self):
+        """
+        Get the board as rows of values (0 empty, 1 Black, -1 White).
+        """
+        return [[self.get_piece_at(r, c) for c in range(self.board_size)] for r in range(self.board_size)]
+
+    def subscribe(self, listener):
+        """
+        Register a function called with a tuple of change events after each move, pass
+        or reset, as GoGame.subscribe() (there is no simple ko here, so no KoChanged).
+        :param listener: Callable taking the tuple of events.
+        """
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """
+        Stop calling a function registered with subscribe().
+        :raises ValueError: If it is not subscribed.
+        """
+        self.listeners.remove(listener)
+
+    def publish(self, events):
+        """
+        Send a batch of change events to the subscribers, if there is any event.
+        """
+        if events:
+            events = tuple(events)
+            for listener in self.listeners[:]:
+                listener(events)
+
+    def bit(self, row, col):
+        """
+        Get the bitmask of a single position.
+        """
+        return 1 << (row * self.width + col)
+
+    def dilate(self, mask):
+        """
+        Grow a set of points by one step in the four orthogonal directions.
+        :param mask: Bitmask of points.
+        :return: Bitmask of the points and all their neighbors.
+        """
+        width = self.width
+        return (mask | mask << 1 | mask >> 1 | mask << width | mask >> width) & self.on_board
+
+    def flood(self, seed, region):
+        """
+        Grow a seed through connected points of a region, a whole board step at a time.
+        :param seed: Bitmask of the starting points (must lie in region).
+        :param region: Bitmask of points the fill may spread through.
+        :return: Bitmask of all points of region connected to the seed.
+        """
+        while True:
+            grown = self.dilate(seed) & region
+            if grown == seed:
+                return seed
+            seed = grown
+
+    def positions(self, mask):
+        """
+        List the (row, col) positions of the bits set in a mask.
+        """
+        positions = []
+        while mask:
+            low = mask & -mask
+            positions.append(divmod(low.bit_length() - 1, self.width))
+            mask ^= low
+        return positions
+
+    def play(self, row, col, color):
+        """
+        Work out the result of a move without changing the game.
+        :param row: Row index.
+        :param col: Column index.
+        :param color: 1 for Black, -1 for White.
+        :return: (own, opponent, captured) bitmasks after the move, or None if the
+                 point is occupied or the move is suicide.
+        """
+        if not self.is_within_bounds(row, col):
+            return None
+        bit = self.bit(row, col)
+        own = self.stones[color]
+        opponent = self.stones[-color]
+        if (own | opponent) & bit:
+            return None
+
+        own |= bit
+        empty = self.on_board & ~(own | opponent)
+        captured = 0
+        for neighbor in (bit << 1, bit >> 1, bit << self.width, bit >> self.width):
+            if neighbor & opponent & ~captured:
+                chain = self.flood(neighbor, opponent)
+                if not self.dilate(chain) & empty:
+                    captured |= chain
+        opponent &= ~captured
+        empty |= captured
+
+        if not self.dilate(self.flood(bit, own)) & empty:
+            return None  # Suicide
+        return own, opponent, captured
+
+    def place_stone(self, row, col):
+        """
+        Place a stone at (row, col) for the current player.
+        :param row: Row index.
+        :param col: Column index.
+        :return: List of captured positions or None if the move is invalid.
+        """
+        color = self.current_player
+        result = self.play(row, col, color)
+        if result is None:
+            return None
+        own, opponent, captured = result
+
+        # Check KO rule (positional superko)
+        state = (own, opponent) if color == 1 else (opponent, own)
+        if state in self.previous_states:
+            return None
+
+        self.previous_states.add(state)
+        self.stones[color] = own
+        self.stones[-color] = opponent
+        captured_positions = self.positions(captured)
+        self.captured_stones[color] += len(captured_positions)
+        self.current_player *= -1  # Switch turns
+        self.pass_count = 0
+        if self.listeners:
+            events = [StonesAdded(((row, col),), color)]
+            if captured_positions:
+                events.append(StonesRemoved(tuple(captured_positions), -color))
+                events.append(ScoreChanged((self.captured_stones[1], self.captured_stones[-1])))
+            events.append(PlayerChanged(self.current_player))
+            self.publish(events)
+        return captured_positions
+
+    def is_valid_move(self, row, col):
+        """
+        Check if a move is valid (ignoring the KO rule).
+        :param row: Row index.
+        :param col: Column index.
+        :return: True if valid, False otherwise.
+        """
+        return self.play(row, col, self.current_player) is not None
+
+    def calculate_scores(self, final=False):
+        """
+        Calculate the scores for both players.
+        A region of empty points is territory when only one color borders it.
+        :param final: Accepted for compatibility with GoGame; no dead stones are removed here.
+        :return: Dictionary with scores for black and white.
+        """
+        black = self.stones[1]
+        white = self.stones[-1]
+        territories = {1: 0, -1: 0}
+
+        if black | white:
+            empty = self.on_board & ~(black | white)
+            while empty:
+                region = self.flood(empty & -empty, empty)
+                empty &= ~region
+                border = self.dilate(region) & ~region
+                if not border & white:
+                    territories[1] += bin(region).count("1")
+                elif not border & black:
+                    territories[-1] += bin(region).count("1")
+
+        # Add captured stones and komi
+        territories[1] += self.captured_stones[1]  # Black's score
+        territories[-1] += self.captured_stones[-1] + self.komi  # White's score with komi
+        return {"black": territories[1], "white": territories[-1]}
+
+    def get_piece_at(self, row, col):
+        """
+        Get the state of the piece at a specific position.
+        :param row: Row index.
+        :param col: Column index.
+        :return: The state of the piece (0 for empty, 1 for Black, -1 for White).
+        """
+        if not self.is_within_bounds(row, col):
+            return None
+        bit = self.bit(row, col)
+        if self.stones[1] & bit:
+            return 1
+        if self.stones[-1] & bit:
+            return -1
+        return 0
+
+    def is_within_bounds(self, row, col):
+        """
+        Check if a position is within the board boundaries.
+        :param row: Row index.
+        :param col: Column index.
+        :return: True if within bounds, False otherwise.
+        """
+        return 0 <= row < self.board_size and 0 <= col < self.board_size
+
+    def get_current_player(self):
+        """
+        Get the current player.
+        :return: 1 for Black, -1 for White.
+        """
+        return self.current_player
+
+    def is_game_over(self):
+        """
+        Check if the game is over (two consecutive passes).
+        :return: True if game over, False otherwise.
+        """
+        return self.pass_count >= 2
+
+    def pass_turn(self):
+        """
+        Pass the current player's turn. If both players pass consecutively, the game ends.
+        """
+        self.pass_count += 1
+        if self.pass_count >= 2:  # Both players passed consecutively
+            return True  # Signal that the game should end
+        self.current_player *= -1  # Switch turns
+        self.publish([PlayerChanged(self.current_player)] if self.listeners else ())
+        return False  # Game continues
@@ -0,0 +1,1841 @@
+from .piece import Piece, Chain
+from .grid import EMPTY, BLACK, WHITE, BORDER, get_grid, BoardView
+from .zobrist import zobrist_table, WHITE_TO_MOVE_KEY
+from .rules import AREA, SITUATIONAL, DEFAULT_RULES, get_rules
+from .history import PositionHistory, MoveLog
+from .persistent import PersistentBoard, Position
+from .patterns import VALUE_CODE, COLOR_MASK, ATARI_BITS, RANDOM_WEIGHT, get_pattern_weights, get_pattern_links, board_patterns
+from array import array
+from collections import namedtuple
+import logging
+
+# Debug output of the game logic; silent unless the application configures logging
+logger = logging.getLogger(__name__)
+
+MIN_BOARD_SIZE = 5
+MAX_BOARD_SIZE = 52  # Largest board SGF can describe
+
+
+# Outcome of GoGame.try_move(); reason is None for a legal move
+MoveResult = namedtuple("MoveResult", "legal reason captured liberties position_hash")
+
+# Result of GoGame.pass_alive(): stones of the unconditionally alive chains and points of
+# their vital regions (empty points and the dead opponent stones inside), as flat points
+PassAlive = namedtuple("PassAlive", "stones regions")
+
+# Result of GoGame.find_seki(), as sets of flat points: stones of the chains in seki, the
+# liberties they share, their eyes and every neutral empty point (dame)
+Seki = namedtuple("Seki", "stones liberties eyes dame")
+
+# Change events published to the subscribers of a GoGame (see GoGame.subscribe), with
+# positions as (row, col): stones put on or taken off the board, the player to move,
+# the prisoner counts as (taken by Black, taken by White) and the ko point (or None)
+StonesAdded = namedtuple("StonesAdded", "positions color")
+StonesRemoved = namedtuple("StonesRemoved", "positions color")
+PlayerChanged = namedtuple("PlayerChanged", "player")
+ScoreChanged = namedtuple("ScoreChanged", "captured_stones")
+KoChanged = namedtuple("KoChanged", "ko_point")
+
+# Largest empty region counted as an eye of a chain in seki
+MAX_EYE_SIZE = 3
+
+# Characters accepted by GoGame.set_position() in board strings
+STONE_CHARACTERS = {
+    ".": EMPTY, "+": EMPTY,
+    "X": BLACK, "x": BLACK, "B": BLACK, "b": BLACK,
+    "O": WHITE, "o": WHITE, "W": WHITE, "w": WHITE,
+}
+
+# Reasons a move can be illegal
+OUT_OF_BOUNDS = "out of bounds"
+OCCUPIED = "occupied"
+SUICIDE = "suicide"
+KO = "ko"
+
+
+def handicap_points(board_size, count):
+    """
+    Get the standard handicap points for Black.
+    Boards of 7 and more have corner points (on the 3rd line, or the 4th from 13x13 up);
+    odd sizes also have side and center points, allowing up to 9 stones.
+    :param board_size: The size of the Go board.
+    :param count: Number of handicap stones (0, or 2 to 9).
+    :return: List of (row, col) positions.
+    :raises ValueError: If the board does not support that many handicap stones.
+    """
+    if count == 0:
+        return []
+    limit = 0 if board_size < 7 else (9 if board_size % 2 else 4)
+    if not 2 <= count <= limit:
+        raise ValueError(f"A {board_size}x{board_size} board does not support a handicap of {count}.")
+    near = 2 if board_size < 13 else 3
+    far = board_size - 1 - near
+    middle = board_size // 2
+    corners = [(near, far), (far, near), (far, far), (near, near)]
+    sides = [(middle, near), (middle, far), (near, middle), (far, middle)]
+    center = [(middle, middle)]
+    if count <= 4:
+        return corners[:count]
+    if count == 5:
+        return corners + center
+    if count == 6:
+        return corners + sides[:2]
+    if count == 7:
+        return corners + sides[:2] + center
+    if count == 8:
+        return corners + sides
+    return corners + sides + center
+
+
+class GoGame:
+    def __init__(self, board_size, komi=6.5, rules=DEFAULT_RULES):
+        """
+        Initialize the game logic.
+        :param board_size: The size of the Go board (e.g., 9 for a 9x9 board), from 5 to 52.
+        :param komi: Compensation points for the white player.
+        :param rules: RuleSet (see rules.py) or its name, selecting scoring, superko and suicide.
+        """
+        if not MIN_BOARD_SIZE <= board_size <= MAX_BOARD_SIZE:
+            raise ValueError(f"Board size must be between {MIN_BOARD_SIZE} and {MAX_BOARD_SIZE}.")
+        self.board_size = board_size
+        self.komi = komi
+        self.rules = get_rules(rules)
+        # Key mixed into the history hash for each player to move; both are 0 under positional
+        # superko, so the rule costs no branch when a move is checked or recorded
+        white_key = WHITE_TO_MOVE_KEY if self.rules.superko == SITUATIONAL else 0
+        self.side_keys = {1: 0, -1: white_key}
+        self.listeners = []  # Functions called with the change events, see subscribe()
+        self.reset_game()
+
+    def reset_game(self):
+        """
+        Reset the game state and initialize the board.
+        """
+        if self.listeners:
+            before = self.event_state()
+            old_board = self.board
+        self.grid = get_grid(self.board_size)
+        self.board = self.grid.new_board()  # Padded flat board, see grid.Grid
+        self.chains = [None] * self.grid.area  # Chain at each point, None if empty
+        self.current_player = 1  # Start with Black (1)
+        self.pass_count = 0
+        self.previous_states = PositionHistory()  # Zobrist hashes of earlier positions (superko)
+        self.captured_stones = {1: 0, -1: 0}
+        self.zobrist = zobrist_table(self.board_size)
+        self.position_hash = 0  # Zobrist hash of the current position (empty board is 0)
+        self.chain_owner = object()  # Token marking the chains this game may modify
+        self.snapshot_board = PersistentBoard(self.board_size)  # Board of the last snapshot()
+        self.changed_rows = set()  # Rows of the board changed since the last snapshot()
+        self.ko_point = None  # Point retaken by a simple ko capture, None if there is none
+        self.redo_stack = []  # (row, col) or None for a pass, per move taken back
+        self.legal_cache = None  # (key, legal points, legal positions) for the last position asked
+        self.region_of = [None] * self.grid.area  # (points, owner) of the empty region at each point
+        self.territory = {1: 0, -1: 0}  # Empty points surrounded by each color
+        self.dirty_points = set(self.grid.points)  # Points changed since the last update_regions()
+        self.empty_points = list(self.grid.points)  # Empty points, in any order
+        self.empty_slot = [-1] * self.grid.area  # Index of each empty point in empty_points
+        for i, p in enumerate(self.empty_points):
+            self.empty_slot[p] = i
+        self.pattern_links = get_pattern_links(self.grid)
+        self.patterns = board_patterns(self.board, self.grid)  # 3x3 pattern code of each point, see patterns.py
+        self.atari_dirty = set()  # Points whose atari flags must be refreshed
+        self.atari_points = set()  # Empty points that are the last liberty of a chain (as of the last refresh)
+        self.move_log = MoveLog(self.snapshot())  # Packed moves for undo and position_at()
+        logger.debug("Game reset: Starting with Black (1)")
+        if self.listeners:
+            self.publish(self.board_events(old_board), before)
+
+    @property
+    def board_state(self):
+        """
+        Read-only view of the board, indexed as board_state[row][col].
+        """
+        return BoardView(self.board, self.grid)
+
+    def get_board_snapshot(self):
+        """
+        Return a copy of the board state as a tuple of row tuples, e.g. to compare or
+        store positions. Ko and superko are checked on position_hash, not on this.
+        """
+        return tuple(tuple(row) for row in self.board_state)
+
+    def get_chain(self, row, col):
+        """
+        Get the chain occupying a position.
+        :param row: Row index.
+        :param col: Column index.
+        :return: The Chain at (row, col), or None if the point is empty.
+        """
+        return self.chains[self.grid.point(row, col)]
+
+    def captured_chains(self, point, color):
+        """
+        Find the opponent chains that a stone of the given color at point would capture.
+        :param point: Flat point index.
+        :param color: Color of the stone being played.
+        :return: List of distinct chains whose only liberty is point.
+        """
+        captured = []
+        for q in self.grid.neighbors[point]:
+            chain = self.chains[q]
+            if chain is not None and chain.color == -color and chain.in_atari() and chain not in captured:
+                captured.append(chain)
+        return captured
+
+    def place_stone(self, row, col):
+        """
+        Place a stone at (row, col) for the current player.
+        :param row: Row index.
+        :param col: Column index.
+        :return: List of captured positions or None if the move is invalid.
+        """
+        if not self.is_valid_move(row, col):
+            return None
+        point = self.grid.point(row, col)
+        if point == self.ko_point:
+            return None
+
+        # Check KO rule (superko) on the hash the move would produce
+        color = self.current_player
+        zobrist = self.zobrist
+        new_hash = self.position_hash ^ zobrist[color][point]
+        captured = self.captured_chains(point, color)
+        for chain in captured:
+            keys = zobrist[chain.color]
+            for p in chain.stones:
+                new_hash ^= keys[p]
+        if not captured and self.rules.suicide and self.is_suicide(row, col):
+            new_hash = self.suicide_hash(point, color)
+        if new_hash ^ self.side_keys[-color] in self.previous_states:
+            return None
+
+        captured_points = self.play_point(point)
+        if captured_points:
+            logger.debug("Captured stones updated: %s", self.captured_stones)
+        row_col = self.grid.row_col
+        return [row_col(p) for p in captured_points]
+
+    def play_point(self, point):
+        """
+        Play a move that is already known to be legal: place the stone, capture, and
+        update the ko point, the history and the turn. No legality checks are made.
+        :param point: Flat point index of the move.
+        :return: Tuple of captured points.
+        """
+        color = self.current_player
+        before = self.event_state() if self.listeners else None
+        ko_point = self.ko_point
+        chain = self.add_stone(point, color)
+
+        # Capture opponent chains left without liberties
+        captured = ()
+        chains = self.chains
+        for q in self.grid.neighbors[point]:
+            neighbor = chains[q]
+            if neighbor is not None and neighbor.color != color and not neighbor.liberties:
+                captured += tuple(self.remove_chain(neighbor))
+        suicided = ()
+        if captured:
+            self.captured_stones[color] += len(captured)
+        elif not chain.liberties:
+            # Suicide (only legal under rules that allow it) removes the new chain
+            suicided = tuple(self.remove_chain(chain))
+            self.captured_stones[-color] += len(suicided)
+
+        # A lone stone that captured a single stone and has that point as its only liberty can be retaken
+        if len(captured) == 1 and len(chain.stones) == 1 and len(chain.liberties) == 1:
+            self.ko_point = captured[0]
+        else:
+            self.ko_point = None
+
+        self.previous_states.add(self.position_hash ^ self.side_keys[-color])
+        self.current_player = -color  # Switch turns
+        self.pass_count = 0
+        self.record_move(point, color, ko_point, captured or suicided, bool(suicided))
+        if before is not None:
+            events = [self.stone_event(StonesAdded, (point,), color)]
+            if captured:
+                events.append(self.stone_event(StonesRemoved, captured, -color))
+            elif suicided:
+                events.append(self.stone_event(StonesRemoved, suicided, color))
+            self.publish(events, before)
+        return captured
+
+    def apply_moves(self, moves, trusted=True, verify=False):
+        """
+        Replay a sequence of moves, e.g. to rebuild a position from an archived game.
+        Trusted input skips every legality check and the debug output; captures, hash,
+        history and prisoner counts are still maintained, and the moves can be undone.
+        :param moves: Iterable of (row, col) positions, or None for a pass.
+        :param trusted: True if the moves are known to be legal (see replay_trusted()).
+        :param verify: Check every move anyway (implied when trusted is False).
+        :raises ValueError: In checked mode, at the first illegal move (earlier moves stay played).
+        """
+        if trusted and not verify:
+            self.replay_trusted(moves)
+            return
+        point = self.grid.point
+        for index, move in enumerate(moves):
+            if move is None:
+                self.pass_turn()
+            else:
+                result = self.try_move(*move)
+                if not result.legal:
+                    raise ValueError(f"Move {index} at {move} is illegal ({result.reason}).")
+                self.play_point(point(*move))
+
+    def replay_trusted(self, moves):
+        """
+        Play known-legal moves on the board array alone: captures are found by a flood
+        fill from the stones next to each move, and the hash, prisoners, ko point,
+        superko history and move log are kept as in play_point(). The chains, empty
+        points, pattern codes and regions are rebuilt once at the end (rebuild_state).
+        Subscribers get a single batch for the whole replay.
+        :param moves: Iterable of (row, col) positions, or None for a pass.
+        """
+        before = self.event_state() if self.listeners else None
+        old_board = self.board[:] if before is not None else None
+        board = self.board
+        neighbors = self.grid.neighbors
+        point = self.grid.point
+        width = self.grid.width
+        changed_rows = self.changed_rows
+        zobrist = self.zobrist
+        side_keys = self.side_keys
+        hashes = array("Q")  # Superko history of the replay, recorded in one go
+        log = self.move_log
+        captured_stones = self.captured_stones
+        position_hash = self.position_hash
+        color = self.current_player
+        ko_point = self.ko_point
+        pass_count = self.pass_count
+        interval = log.KEYFRAME_INTERVAL
+        count = len(log)
+        for move in moves:
+            ko_before = ko_point
+            count += 1
+            if move is None:
+                ko_point = None
+                pass_count += 1
+                log.append(None, color, ko_before)
+                if pass_count < 2:
+                    color = -color
+            else:
+                p = point(*move)
+                board[p] = color
+                position_hash ^= zobrist[color][p]
+                changed_rows.add(p // width - 1)
+                removed = []
+                for q in neighbors[p]:
+                    if board[q] == -color:
+                        chain = self.dead_chain(q)
+                        if chain:
+                            keys = zobrist[-color]
+                            for r in chain:
+                                board[r] = EMPTY
+                                position_hash ^= keys[r]
+                                changed_rows.add(r // width - 1)
+                            removed += chain
+                suicide = False
+                if removed:
+                    captured_stones[color] += len(removed)
+                else:
+                    chain = self.dead_chain(p)
+                    if chain:
+                        # Suicide (only in trusted input under rules that allow it)
+                        keys = zobrist[color]
+                        for r in chain:
+                            board[r] = EMPTY
+                            position_hash ^= keys[r]
+                            changed_rows.add(r // width - 1)
+                        captured_stones[-color] += len(chain)
+                        removed = chain
+                        suicide = True
+                ko_point = None
+                if len(removed) == 1 and not suicide:
+                    empty = friends = 0
+                    for q in neighbors[p]:
+                        if board[q] == EMPTY:
+                            empty += 1
+                        elif board[q] == color:
+                            friends += 1
+                    if empty == 1 and friends == 0:
+                        ko_point = removed[0]
+                log.append(p, color, ko_before, removed, suicide)
+                hashes.append(position_hash ^ side_keys[-color])
+                color = -color
+                pass_count = 0
+            if count % interval == 0 and log.needs_keyframe():
+                self.position_hash = position_hash
+                self.current_player = color
+                self.ko_point = ko_point
+                log.add_keyframe(self.snapshot())
+
+        self.position_hash = position_hash
+        self.current_player = color
+        self.ko_point = ko_point
+        self.pass_count = pass_count
+        self.previous_states.extend(hashes)
+        self.redo_stack = []
+        self.rebuild_state()
+        if before is not None:
+            self.publish(self.board_events(old_board), before)
+
+    def dead_chain(self, point):
+        """
+        Flood fill the chain at a point on the board array, stopping at its first liberty.
+        :param point: Flat point of a stone.
+        :return: List of the points of the chain if it has no liberty, otherwise None.
+        """
+        board = self.board
+        neighbors = self.grid.neighbors
+        color = board[point]
+        stones = [point]
+        seen = {point}
+        for p in stones:
+            for q in neighbors[p]:
+                value = board[q]
+                if value == EMPTY:
+                    return None
+                if value == color and q not in seen:
+                    seen.add(q)
+                    stones.append(q)
+        return stones
+
+    def try_move(self, row, col):
+        """
+        Work out what playing at (row, col) would do for the current player, without
+        changing the board, the chains or the history.
+        :param row: Row index.
+        :param col: Column index.
+        :return: MoveResult with legal, the reason it is illegal (None if legal), the
+                 positions that would be captured (the player's own removed stones for
+                 an allowed suicide), the frozenset of (row, col) liberties of the chain
+                 the new stone would belong to and the resulting position hash.
+        """
+        if not self.is_within_bounds(row, col):
+            return MoveResult(False, OUT_OF_BOUNDS, (), frozenset(), self.position_hash)
+        point = self.grid.point(row, col)
+        if self.board[point] != EMPTY:
+            return MoveResult(False, OCCUPIED, (), frozenset(), self.position_hash)
+
+        board = self.board
+        chains = self.chains
+        neighbors = self.grid.neighbors
+        color = self.current_player
+        new_hash = self.position_hash ^ self.zobrist[color][point]
+        liberties = set()
+        friends = []
+        captured = []
+        for q in neighbors[point]:
+            value = board[q]
+            if value == EMPTY:
+                liberties.add(q)
+            elif value == color:
+                chain = chains[q]
+                if chain not in friends:
+                    friends.append(chain)
+                    liberties |= chain.liberties
+            elif value != BORDER:
+                chain = chains[q]
+                if chain.in_atari() and chain not in captured:
+                    captured.append(chain)
+        liberties.discard(point)
+
+        # Captured stones next to the new chain become its liberties
+        captured_points = []
+        if captured:
+            keys = self.zobrist[-color]
+            for chain in captured:
+                for p in chain.stones:
+                    new_hash ^= keys[p]
+                    captured_points.append(p)
+                    for r in neighbors[p]:
+                        if r == point or (board[r] == color and chains[r] in friends):
+                            liberties.add(p)
+                            break
+
+        if not liberties:
+            if not (self.rules.suicide and friends):
+                return MoveResult(False, SUICIDE, (), frozenset(), self.position_hash)
+            # Allowed suicide: the new stone and the friendly chains it joins are removed
+            new_hash = self.position_hash
+            keys = self.zobrist[color]
+            captured_points = [point]
+            for chain in friends:
+                for p in chain.stones:
+                    new_hash ^= keys[p]
+                    captured_points.append(p)
+
+        row_col = self.grid.row_col
+        captured_positions = tuple(row_col(p) for p in captured_points)
+        liberty_positions = frozenset(row_col(p) for p in liberties)
+        if point == self.ko_point or new_hash ^ self.side_keys[-color] in self.previous_states:
+            return MoveResult(False, KO, captured_positions, liberty_positions, new_hash)
+        return MoveResult(True, None, captured_positions, liberty_positions, new_hash)
+
+    def record_move(self, point, color, ko_point, removed=(), suicide=False):
+        """
+        Add a move that has just been played to the move log, which is the undo history,
+        and drop the moves that could have been redone.
+        :param point: Flat point index of the move, or None for a pass.
+        :param color: Color that played it.
+        :param ko_point: Ko point before the move, or None.
+        :param removed: Points of the stones it captured, or of its own stones lost by suicide.
+        :param suicide: True if the removed stones are its own.
+        """
+        log = self.move_log
+        log.append(point, color, ko_point, removed, suicide)
+        if self.redo_stack:
+            self.redo_stack = []
+        if log.needs_keyframe():
+            log.add_keyframe(self.snapshot())
+
+    def undo(self):
+        """
+        Take back the last move or pass, read from the move log. Only the played stone,
+        the removed stones and the counters are touched; the position hash follows the
+        stones, and the pass count is the number of passes left at the end of the log.
+        :return: True if a move was taken back, False if there was nothing to undo.
+        """
+        if not len(self.move_log):
+            return False
+        before = self.event_state() if self.listeners else None
+        events = []
+        point, color, ko_point, removed, suicide = self.move_log.pop()
+        if point is None:
+            self.redo_stack.append(None)
+        else:
+            self.previous_states.pop()
+            if suicide:
+                for p in removed:
+                    if p != point:
+                        self.add_stone(p, color)
+                self.captured_stones[-color] -= len(removed)
+            else:
+                self.remove_stone(point)
+                for p in removed:
+                    self.add_stone(p, -color)
+                self.captured_stones[color] -= len(removed)
+            self.redo_stack.append(self.grid.row_col(point))
+            if before is not None:
+                if suicide:
+                    restored = [p for p in removed if p != point]
+                    events.append(self.stone_event(StonesAdded, restored, color))
+                else:
+                    events.append(self.stone_event(StonesRemoved, (point,), color))
+                    if removed:
+                        events.append(self.stone_event(StonesAdded, removed, -color))
+
+        self.ko_point = ko_point
+        self.pass_count = self.move_log.trailing_passes()
+        self.current_player = color
+        if before is not None:
+            self.publish(events, before)
+        return True
+
+    def redo(self):
+        """
+        Play again the last move taken back by undo().
+        :return: True if a move was replayed, False if there was nothing to redo.
+        """
+        if not self.redo_stack:
+            return False
+        redo_stack = self.redo_stack
+        move = redo_stack.pop()
+        if move is None:
+            self.pass_turn()
+        else:
+            self.place_stone(*move)
+        self.redo_stack = redo_stack  # Replaying must not drop the remaining redo moves
+        return True
+
+    def remove_stone(self, point):
+        """
+        Take a single stone off the board, splitting its chain if it was a connection.
+        A stone with at most one friendly neighbor cannot disconnect its chain and costs
+        O(neighbors); otherwise the chain is rebuilt in O(size of the chain).
+        :param point: Flat point index of the stone.
+        """
+        board = self.board
+        chains = self.chains
+        neighbors = self.grid.neighbors
+        color = board[point]
+        old_chain = self.own_chain(chains[point])
+        board[point] = EMPTY
+        chains[point] = None
+        self.position_hash ^= self.zobrist[color][point]
+        self.dirty_points.add(point)
+        self.changed_rows.add(point // self.grid.width - 1)
+        self.empty_slot[point] = len(self.empty_points)
+        self.empty_points.append(point)
+        patterns = self.patterns
+        value = VALUE_CODE[color]
+        for q, shift in self.pattern_links[point]:
+            patterns[q] -= value << shift
+        self.atari_dirty.add(point)
+        self.atari_dirty.update(neighbors[point])  # Their flag toward this point may be stale
+
+        friends = 0
+        for q in neighbors[point]:
+            if chains[q] is old_chain:
+                friends += 1
+        if friends <= 1:
+            # The rest of the chain stays connected; only drop liberties it no longer touches
+            old_chain.stones.discard(point)
+            for q in neighbors[point]:
+                if board[q] == EMPTY:
+                    for r in neighbors[q]:
+                        if chains[r] is old_chain:
+                            break
+                    else:
+                        old_chain.liberties.discard(q)
+            if len(old_chain.liberties) <= 2:
+                self.touch_liberties(old_chain)
+        else:
+            # Rebuild the chains of the stones that were connected through this point
+            remaining = old_chain.stones
+            remaining.discard(point)
+            while remaining:
+                seed = remaining.pop()
+                chain = Chain(color, self.chain_owner)
+                chain.stones.add(seed)
+                stack = [seed]
+                while stack:
+                    p = stack.pop()
+                    chains[p] = chain
+                    for q in neighbors[p]:
+                        if board[q] == EMPTY:
+                            chain.liberties.add(q)
+                        elif q in remaining:
+                            remaining.discard(q)
+                            chain.stones.add(q)
+                            stack.append(q)
+                if len(chain.liberties) <= 2:
+                    self.touch_liberties(chain)
+
+        for q in neighbors[point]:
+            neighbor = chains[q]
+            if neighbor is not None:
+                if neighbor.owner is not self.chain_owner:
+                    neighbor = self.own_chain(neighbor)
+                neighbor.liberties.add(point)
+                if len(neighbor.liberties) <= 2:
+                    self.touch_liberties(neighbor)
+
+    def add_stone(self, point, color):
+        """
+        Put a stone on the board and update the chains around it.
+        The new stone takes a liberty from each neighboring chain and merges with friendly ones.
+        :param point: Flat point index.
+        :param color: 1 for Black, -1 for White.
+        :return: The chain the new stone belongs to.
+        """
+        self.board[point] = color
+        self.position_hash ^= self.zobrist[color][point]
+        self.dirty_points.add(point)
+        self.changed_rows.add(point // self.grid.width - 1)
+        self.take_empty(point)
+        patterns = self.patterns
+        value = VALUE_CODE[color]
+        for q, shift in self.pattern_links[point]:
+            patterns[q] += value << shift
+        self.atari_dirty.add(point)  # No longer a liberty
+
+        chains = self.chains
+        owner = self.chain_owner
+        chain = Chain(color, owner)
+        chain.stones.add(point)
+        for q in self.grid.neighbors[point]:
+            neighbor = chains[q]
+            if neighbor is None:
+                if self.board[q] == EMPTY:
+                    chain.liberties.add(q)
+                continue
+            if neighbor.owner is not owner:
+                neighbor = self.own_chain(neighbor)
+            neighbor.liberties.discard(point)
+            if len(neighbor.liberties) <= 2:
+                self.touch_liberties(neighbor)
+            if neighbor.color == color and neighbor is not chain:
+                # Merge the smaller chain into the larger one
+                if len(neighbor.stones) > len(chain.stones):
+                    chain, neighbor = neighbor, chain
+                chain.merge(neighbor)
+                for p in neighbor.stones:
+                    chains[p] = chain
+        chains[point] = chain
+        if len(chain.liberties) <= 2:
+            self.touch_liberties(chain)
+        return chain
+
+    def touch_liberties(self, chain):
+        """
+        Note that a chain with at most two liberties has just had its liberties changed,
+        so it may have entered or left atari.
+        :param chain: The chain.
+        """
+        self.atari_dirty.update(chain.liberties)
+
+    def subscribe(self, listener):
+        """
+        Register a function to be told about every change of the game. After each move,
+        pass, undo or new position it is called once with a tuple of change events
+        (StonesAdded, StonesRemoved, PlayerChanged, ScoreChanged, KoChanged), so a view
+        can apply the differences instead of reading the whole board again.
+        Clones start without subscribers, and no events are built while there are none.
+        :param listener: Callable taking the tuple of events.
+        """
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """
+        Stop calling a function registered with subscribe().
+        :param listener: The registered callable.
+        :raises ValueError: If it is not subscribed.
+        """
+        self.listeners.remove(listener)
+
+    def event_state(self):
+        """
+        Get the state that publish() compares to report the turn, prisoner and ko changes.
+        :return: (player to move, ko point, Black prisoners, White prisoners).
+        """
+        return self.current_player, self.ko_point, self.captured_stones[1], self.captured_stones[-1]
+
+    def stone_event(self, kind, points, color):
+        """
+        Build a StonesAdded or StonesRemoved event.
+        :param kind: StonesAdded or StonesRemoved.
+        :param points: Flat point indices.
+        :param color: Color of the stones.
+        :return: The event, with the points as (row, col).
+        """
+        row_col = self.grid.row_col
+        return kind(tuple(row_col(p) for p in points), color)
+
+    def board_events(self, old_board):
+        """
+        Describe the difference between an earlier board array and the current one.
+        :param old_board: Board array of the same size.
+        :return: List of StonesRemoved and StonesAdded events.
+        """
+        board = self.board
+        removed = {BLACK: [], WHITE: []}
+        added = {BLACK: [], WHITE: []}
+        for p in self.grid.points:
+            old, new = old_board[p], board[p]
+            if old != new:
+                if old != EMPTY:
+                    removed[old].append(p)
+                if new != EMPTY:
+                    added[new].append(p)
+        events = [self.stone_event(StonesRemoved, removed[color], color) for color in (BLACK, WHITE) if removed[color]]
+        events += [self.stone_event(StonesAdded, added[color], color) for color in (BLACK, WHITE) if added[color]]
+        return events
+
+    def publish(self, events, before):
+        """
+        Send a batch of change events to the subscribers, adding the ko, prisoner and turn
+        changes since an earlier event_state(). Nothing is sent if nothing changed.
+        :param events: Stone events of the change.
+        :param before: event_state() from before the change.
+        """
+        events = list(events)
+        player, ko_point, black, white = before
+        if self.ko_point != ko_point:
+            events.append(KoChanged(None if self.ko_point is None else self.grid.row_col(self.ko_point)))
+        captured_stones = (self.captured_stones[1], self.captured_stones[-1])
+        if captured_stones != (black, white):
+            events.append(ScoreChanged(captured_stones))
+        if self.current_player != player:
+            events.append(PlayerChanged(self.current_player))
+        if events:
+            events = tuple(events)
+            for listener in self.listeners[:]:
+                listener(events)
+
+    def take_empty(self, point):
+        """
+        Remove a point from the empty point list in O(1): the last entry takes its slot.
+        :param point: Flat index of a point that was empty.
+        """
+        empty_points = self.empty_points
+        empty_slot = self.empty_slot
+        last = empty_points.pop()
+        if last != point:
+            slot = empty_slot[point]
+            empty_points[slot] = last
+            empty_slot[last] = slot
+        empty_slot[point] = -1
+
+    def remove_chain(self, chain):
+        """
+        Take a captured chain off the board and give its points back as liberties to the chains around it.
+        :param chain: The chain to remove.
+        :return: List of removed points.
+        """
+        board = self.board
+        chains = self.chains
+        neighbors = self.grid.neighbors
+        keys = self.zobrist[chain.color]
+        removed = list(chain.stones)
+        empty_points = self.empty_points
+        empty_slot = self.empty_slot
+        patterns = self.patterns
+        links = self.pattern_links
+        value = VALUE_CODE[chain.color]
+        for p in removed:
+            board[p] = EMPTY  # Remove captured stone
+            chains[p] = None
+            self.position_hash ^= keys[p]
+            empty_slot[p] = len(empty_points)
+            empty_points.append(p)
+            for q, shift in links[p]:
+                patterns[q] -= value << shift
+        self.dirty_points.update(removed)
+        self.atari_dirty.update(removed)
+        width = self.grid.width
+        self.changed_rows.update(p // width - 1 for p in removed)
+        owner = self.chain_owner
+        for p in removed:
+            for q in neighbors[p]:
+                neighbor = chains[q]
+                if neighbor is not None:
+                    if neighbor.owner is not owner:
+                        neighbor = self.own_chain(neighbor)
+                    neighbor.liberties.add(p)
+                    if len(neighbor.liberties) <= 2:
+                        self.touch_liberties(neighbor)
+        return removed
+
+    def own_chain(self, chain):
+        """
+        Make a chain private to this game before changing it. Chains are shared with
+        clones until one side modifies them (copy-on-write).
+        :param chain: Chain at one or more points of this game.
+        :return: The chain itself if this game owns it, otherwise a copy that replaces it.
+        """
+        if chain.owner is self.chain_owner:
+            return chain
+        copy = chain.copy(self.chain_owner)
+        chains = self.chains
+        for p in copy.stones:
+            chains[p] = copy
+        return copy
+
+    def clone(self):
+        """
+        Create an independent copy of the game for exploring variations.
+        The board array and the small counters are copied; chains, empty regions and the
+        superko history are shared and only copied when one of the games changes them.
+        :return: New GoGame in the same position.
+        """
+        other = GoGame.__new__(GoGame)
+        other.__dict__.update(self.__dict__)
+        other.board = self.board[:]
+        other.chains = self.chains[:]
+        other.region_of = self.region_of[:]  # Region tuples are immutable
+        other.empty_points = self.empty_points[:]
+        other.empty_slot = self.empty_slot[:]
+        other.patterns = self.patterns[:]
+        other.atari_dirty = set(self.atari_dirty)
+        other.atari_points = set(self.atari_points)
+        other.dirty_points = set(self.dirty_points)
+        other.changed_rows = set(self.changed_rows)
+        other.territory = dict(self.territory)
+        other.captured_stones = dict(self.captured_stones)
+        other.redo_stack = self.redo_stack[:]
+        other.move_log = self.move_log.copy()
+        other.listeners = []  # Subscribers follow the original game only
+        self.previous_states, other.previous_states = self.previous_states.fork()
+        # Both games lose ownership of the chains they now share
+        self.chain_owner = object()
+        other.chain_owner = object()
+        return other
+
+    def snapshot(self):
+        """
+        Capture the current position as an immutable Position backed by a PersistentBoard.
+        The game keeps the board of its last snapshot and the rows its moves changed since
+        (changed_rows), so only those rows are copied and every other row is shared:
+        storing a snapshot per node of a variation tree costs a few rows per move.
+        :return: Position.
+        """
+        changed = self.changed_rows
+        if changed:
+            size = self.board_size
+            board = self.board
+            width = self.grid.width
+            rows = list(self.snapshot_board.rows)
+            for r in changed:
+                start = (r + 1) * width + 1
+                rows[r] = board[start:start + size].tobytes()
+            self.snapshot_board = self.snapshot_board.with_rows(rows)
+            changed.clear()
+        ko_point = None if self.ko_point is None else self.grid.row_col(self.ko_point)
+        return Position(
+            self.snapshot_board,
+            self.current_player,
+            ko_point,
+            (self.captured_stones[1], self.captured_stones[-1]),
+            self.position_hash,
+        )
+
+    def restore(self, position):
+        """
+        Set the game to a position taken with snapshot(). The chains are rebuilt in one
+        pass; the move history starts again from this position.
+        :param position: Position to load.
+        """
+        self.set_position(
+            position.board.to_lists(),
+            position.current_player,
+            position.ko_point,
+            captured_stones=position.captured_stones,
+        )
+        self.snapshot_board = position.board
+        self.move_log = MoveLog(position)
+
+    def position_at(self, move_number):
+        """
+        Rebuild an earlier position of the game from the move log: the nearest keyframe
+        is loaded and at most MoveLog.KEYFRAME_INTERVAL moves are replayed.
+        :param move_number: Number of moves played, from 0 (the start) to len(self.move_log).
+        :return: Position.
+        :raises ValueError: If there is no such move number.
+        """
+        log = self.move_log
+        if not 0 <= move_number <= len(log):
+            raise ValueError(f"Move number must be between 0 and {len(log)}.")
+        start, position = log.keyframe_before(move_number)
+        if start == move_number:
+            return position
+        game = GoGame(self.board_size, self.komi, self.rules)
+        game.restore(position)
+        for index in range(start, move_number):
+            point, color = log.move(index)
+            game.current_player = color
+            if point is None:
+                game.pass_turn()
+            else:
+                game.play_point(point)
+        # Passes do not reach the keyframes, so take the player to move from the log
+        to_move = log.move(move_number)[1] if move_number < len(log) else self.current_player
+        return game.snapshot()._replace(current_player=to_move)
+
+    def set_position(self, position, to_move, ko_point=None, handicap=0, captured_stones=(0, 0)):
+        """
+        Load an arbitrary position in one linear pass, instead of replaying moves.
+        The move history and the passes start again from here.
+        :param position: Rows of ints (0 empty, 1 Black, -1 White), or a string with one
+                         line per row using '.' or '+' for empty, 'X' or 'B' for Black and
+                         'O' or 'W' for White (spaces are ignored).
+        :param to_move: Player to move, 1 for Black or -1 for White.
+        :param ko_point: Optional (row, col) that the player to move may not retake.
+        :param handicap: Number of Black handicap stones to add on the standard points.
+        :param captured_stones: Prisoners taken so far, as (by Black, by White).
+        :raises ValueError: If the position does not fit the board, a chain has no liberties,
+                            the ko point is not an empty point or a handicap point is taken.
+                            The game is left unchanged.
+        """
+        if isinstance(position, str):
+            rows = []
+            for line in position.splitlines():
+                line = line.replace(" ", "")
+                if line:
+                    try:
+                        rows.append([STONE_CHARACTERS[ch] for ch in line])
+                    except KeyError as error:
+                        raise ValueError(f"Unknown board character {error}.") from None
+            position = rows
+        if to_move not in (BLACK, WHITE):
+            raise ValueError("to_move must be 1 (Black) or -1 (White).")
+
+        size = self.board_size
+        board = self.grid.new_board()
+        point = self.grid.point
+        row_count = 0
+        for r, row in enumerate(position):
+            values = list(row)
+            if r >= size or len(values) != size:
+                raise ValueError(f"Position does not match a {size}x{size} board.")
+            for c, value in enumerate(values):
+                if value not in (EMPTY, BLACK, WHITE):
+                    raise ValueError(f"Invalid value {value!r} at ({r}, {c}).")
+                board[point(r, c)] = value
+            row_count += 1
+        if row_count != size:
+            raise ValueError(f"Position does not match a {size}x{size} board.")
+        for r, c in handicap_points(size, handicap):
+            if board[point(r, c)] != EMPTY:
+                raise ValueError(f"The handicap point ({r}, {c}) is already occupied.")
+            board[point(r, c)] = BLACK
+        if ko_point is not None:
+            r, c = ko_point
+            if not self.is_within_bounds(r, c) or board[point(r, c)] != EMPTY:
+                raise ValueError(f"The ko point {ko_point} is not an empty point of the board.")
+        dead = self.chain_without_liberties(board)
+        if dead is not None:
+            r, c = self.grid.row_col(dead)
+            raise ValueError(f"The chain at ({r}, {c}) has no liberties.")
+
+        # The position is valid; nothing of the game is changed before this point
+        before = self.event_state() if self.listeners else None
+        old_board = self.board
+        self.board = board
+        self.rebuild_state()
+
+        self.current_player = to_move
+        self.ko_point = None if ko_point is None else point(*ko_point)
+        self.captured_stones = {1: captured_stones[0], -1: captured_stones[1]}
+        self.pass_count = 0
+        self.previous_states = PositionHistory()
+        self.previous_states.add(self.position_hash ^ self.side_keys[to_move])
+        self.redo_stack = []
+        self.move_log = MoveLog(self.snapshot())
+        if before is not None:
+            self.publish(self.board_events(old_board), before)
+
+    def chain_without_liberties(self, board):
+        """
+        Find a chain without liberties on a board array, e.g. one about to be loaded.
+        :param board: Board array of this game's size.
+        :return: Flat point of a stone of such a chain, or None if every chain has a liberty.
+        """
+        neighbors = self.grid.neighbors
+        seen = set()
+        for p in self.grid.points:
+            color = board[p]
+            if color == EMPTY or p in seen:
+                continue
+            seen.add(p)
+            stack = [p]
+            free = False
+            while stack:
+                q = stack.pop()
+                for r in neighbors[q]:
+                    value = board[r]
+                    if value == EMPTY:
+                        free = True
+                    elif value == color and r not in seen:
+                        seen.add(r)
+                        stack.append(r)
+            if not free:
+                return p
+        return None
+
+    def position_string(self):
+        """
+        Describe the board in the string format accepted by set_position().
+        :return: One line per row, '.' for empty, 'X' for Black and 'O' for White.
+        """
+        symbols = {EMPTY: ".", BLACK: "X", WHITE: "O"}
+        return "\n".join(
+            "".join(symbols[value] for value in row) for row in self.board_state
+        )
+
+    def rebuild_state(self):
+        """
+        Recompute the chains, the position hash and the region bookkeeping from the board
+        array in one linear pass (each stone is visited once).
+        """
+        board = self.board
+        neighbors = self.grid.neighbors
+        owner = self.chain_owner = object()
+        chains = self.chains = [None] * self.grid.area
+        position_hash = 0
+        for p in self.grid.points:
+            color = board[p]
+            if color == EMPTY:
+                continue
+            position_hash ^= self.zobrist[color][p]
+            if chains[p] is not None:
+                continue
+            chain = Chain(color, owner)
+            chain.stones.add(p)
+            chains[p] = chain
+            stack = [p]
+            while stack:
+                q = stack.pop()
+                for r in neighbors[q]:
+                    value = board[r]
+                    if value == EMPTY:
+                        chain.liberties.add(r)
+                    elif value == color and chains[r] is None:
+                        chains[r] = chain
+                        chain.stones.add(r)
+                        stack.append(r)
+        self.position_hash = position_hash
+        self.region_of = [None] * self.grid.area
+        self.territory = {1: 0, -1: 0}
+        self.dirty_points = set(self.grid.points)
+        self.changed_rows = set(range(self.board_size))
+        self.empty_points = [p for p in self.grid.points if board[p] == EMPTY]
+        self.empty_slot = [-1] * self.grid.area
+        for i, p in enumerate(self.empty_points):
+            self.empty_slot[p] = i
+        self.patterns = board_patterns(board, self.grid)
+        self.atari_dirty = set(self.empty_points)
+        self.atari_points = set()
+        self.legal_cache = None
+
+    def is_valid_move(self, row, col):
+        """
+        Check if a move is valid.
+        :param row: Row index.
+        :param col: Column index.
+        :return: True if valid, False otherwise.
+        """
+        if not self.is_within_bounds(row, col) or self.board[self.grid.point(row, col)] != EMPTY:
+            return False
+        if not self.is_suicide(row, col):
+            return True
+        # Where suicide is allowed it must remove a friendly chain; a lone stone would change nothing
+        color = self.current_player
+        return self.rules.suicide and any(
+            self.board[q] == color for q in self.grid.neighbors[self.grid.point(row, col)]
+        )
+
+    def suicide_hash(self, point, color):
+        """
+        Compute the position hash after a suicide at point, which removes the friendly
+        chains next to it (the new stone itself leaves no trace).
+        :param point: Flat point index of the move.
+        :param color: Color of the stone being played.
+        :return: The resulting position hash.
+        """
+        new_hash = self.position_hash
+        keys = self.zobrist[color]
+        removed = []
+        for q in self.grid.neighbors[point]:
+            chain = self.chains[q]
+            if chain is not None and chain.color == color and chain not in removed:
+                removed.append(chain)
+                for p in chain.stones:
+                    new_hash ^= keys[p]
+        return new_hash
+
+    def legal_points(self):
+        """
+        Get every legal point for the current player, ko and superko included.
+        One pass over the empty points reads only the neighboring chains; the result is
+        cached until the position, the player to move or the history changes.
+        :return: frozenset of flat point indices.
+        """
+        key = (self.position_hash, self.current_player, len(self.previous_states), self.ko_point)
+        cache = self.legal_cache
+        if cache is not None and cache[0] == key:
+            return cache[1]
+
+        board = self.board
+        chains = self.chains
+        neighbors = self.grid.neighbors
+        color = self.current_player
+        own_keys = self.zobrist[color]
+        opponent_keys = self.zobrist[-color]
+        side_key = self.side_keys[-color]
+        position_hash = self.position_hash ^ side_key  # Hashes below are history keys
+        previous_states = self.previous_states
+        suicide = self.rules.suicide
+        legal = []
+        for p in self.grid.points:
+            if board[p] != EMPTY:
+                continue
+            valid = False
+            friendly = False
+            new_hash = position_hash ^ own_keys[p]
+            captured = None
+            for q in neighbors[p]:
+                value = board[q]
+                if value == EMPTY:
+                    valid = True
+                elif value == color:
+                    friendly = True
+                    if len(chains[q].liberties) > 1:
+                        valid = True
+                elif value != BORDER:
+                    chain = chains[q]
+                    if len(chain.liberties) == 1:
+                        if captured is None:
+                            captured = [chain]
+                        elif chain in captured:
+                            continue
+                        else:
+                            captured.append(chain)
+                        valid = True
+                        for stone in chain.stones:
+                            new_hash ^= opponent_keys[stone]
+            if not valid:
+                if not (suicide and friendly):
+                    continue
+                new_hash = self.suicide_hash(p, color) ^ side_key
+            if new_hash not in previous_states and p != self.ko_point:
+                legal.append(p)
+
+        points = frozenset(legal)
+        self.legal_cache = (key, points, None)
+        return points
+
+    def legal_moves(self):
+        """
+        Get every legal move for the current player, ko and superko included.
+        :return: frozenset of (row, col) positions, cached like legal_points().
+        """
+        points = self.legal_points()
+        key, _, moves = self.legal_cache
+        if moves is None:
+            row_col = self.grid.row_col
+            moves = frozenset(row_col(p) for p in points)
+            self.legal_cache = (key, points, moves)
+        return moves
+
+    def is_legal_point(self, point):
+        """
+        Check if the current player may play at an empty point, ko and superko included.
+        Reads only the neighboring chains and the superko history.
+        :param point: Flat index of an empty point.
+        :return: True if legal, False otherwise.
+        """
+        if point == self.ko_point:
+            return False
+        board = self.board
+        chains = self.chains
+        color = self.current_player
+        valid = False
+        captures = False
+        for q in self.grid.neighbors[point]:
+            value = board[q]
+            if value == EMPTY:
+                valid = True
+            elif value == color:
+                if len(chains[q].liberties) > 1:
+                    valid = True
+            elif value != BORDER and len(chains[q].liberties) == 1:
+                valid = captures = True
+        if not valid:
+            return self.rules.suicide and self.try_move(*self.grid.row_col(point)).legal
+
+        new_hash = self.position_hash ^ self.zobrist[color][point]
+        if captures:
+            for chain in self.captured_chains(point, color):
+                keys = self.zobrist[chain.color]
+                for p in chain.stones:
+                    new_hash ^= keys[p]
+        return new_hash ^ self.side_keys[-color] not in self.previous_states
+
+    def random_legal_point(self, rng, excluded=None, fill_eyes=True):
+        """
+        Draw a uniformly random legal point for the current player.
+        Empty points are drawn without replacement from empty_points (rejected ones are
+        swapped to the end of the part still being drawn from), so one draw usually
+        costs O(1) and the worst case visits every empty point once.
+        :param rng: random.Random (or anything with a random() method).
+        :param excluded: Optional set of flat points never returned.
+        :param fill_eyes: False to never return a point that is_true_eye_like() for the
+                          current player (a playout would fill its own eye).
+        :return: Flat point index, or None if there is no such point.
+        """
+        empty_points = self.empty_points
+        empty_slot = self.empty_slot
+        color = self.current_player
+        count = len(empty_points)
+        while count:
+            i = int(rng.random() * count)
+            p = empty_points[i]
+            if (
+                (excluded is None or p not in excluded)
+                and (fill_eyes or not self.is_true_eye_like(p, color))
+                and self.is_legal_point(p)
+            ):
+                return p
+            count -= 1
+            last = empty_points[count]
+            empty_points[i] = last
+            empty_points[count] = p
+            empty_slot[last] = i
+            empty_slot[p] = count
+        return None
+
+    def is_true_eye_like(self, point, color):
+        """
+        Check if an empty point looks like a real eye of the given color, from its eight
+        neighbors: all four orthogonal ones are stones of the color (or the edge), and
+        the opponent holds at most one diagonal point (none on the edge or in a corner).
+        :param point: Flat point index.
+        :param color: 1 for Black, -1 for White.
+        :return: True if the point is eye-like for the color.
+        """
+        board = self.board
+        if board[point] != EMPTY:
+            return False
+        for q in self.grid.neighbors[point]:
+            value = board[q]
+            if value != color and value != BORDER:
+                return False
+        edge = False
+        opponent = 0
+        for q in self.grid.diagonals[point]:
+            value = board[q]
+            if value == BORDER:
+                edge = True
+            elif value == -color:
+                opponent += 1
+        return opponent < (1 if edge else 2)
+
+    def refresh_patterns(self):
+        """
+        Bring the atari flags of the pattern codes up to date. Only the points noted by
+        touch_liberties() since the last refresh are looked at.
+        """
+        dirty = self.atari_dirty
+        if not dirty:
+            return
+        board = self.board
+        chains = self.chains
+        neighbors = self.grid.neighbors
+        patterns = self.patterns
+        atari_points = self.atari_points
+        for p in dirty:
+            if board[p] == EMPTY:
+                code = patterns[p] & COLOR_MASK
+                for k, q in enumerate(neighbors[p]):
+                    chain = chains[q]
+                    if chain is not None and len(chain.liberties) == 1:
+                        code |= ATARI_BITS[k]
+                patterns[p] = code
+                if code > COLOR_MASK:
+                    atari_points.add(p)
+                    continue
+            atari_points.discard(p)
+        dirty.clear()
+
+    def chain_at(self, point):
+        """
+        Get the chain at a point in O(1).
+        :param point: Flat point index.
+        :return: Chain, or None if the point is empty.
+        """
+        return self.chains[point]
+
+    def liberties_of(self, point):
+        """
+        Get the liberties of the chain at a point in O(1); their number is the liberty count.
+        The set belongs to the chain and must not be modified.
+        :param point: Flat point index.
+        :return: Set of flat points, empty if the point is empty.
+        """
+        chain = self.chains[point]
+        return chain.liberties if chain is not None else frozenset()
+
+    def chains_in_atari(self, color):
+        """
+        List the chains of a color that have a single liberty. The last liberties of all
+        chains are kept up to date by refresh_patterns(), so the cost is proportional to
+        the number of chains in atari rather than to the board.
+        :param color: 1 for Black, -1 for White.
+        :return: List of Chain.
+        """
+        self.refresh_patterns()
+        chains = self.chains
+        neighbors = self.grid.neighbors
+        found = []
+        for p in self.atari_points:
+            for q in neighbors[p]:
+                chain = chains[q]
+                if chain is not None and chain.color == color and chain.in_atari() and chain not in found:
+                    found.append(chain)
+        return found
+
+    def pattern_code(self, point):
+        """
+        Get the 3x3 pattern code of a point (see patterns.py).
+        :param point: Flat point index.
+        :return: int code.
+        """
+        self.refresh_patterns()
+        return self.patterns[point]
+
+    def pattern_playout_point(self, rng, excluded=None):
+        """
+        Pick a playout move with the pattern policy: the empty points around the last move
+        are weighted by the table of get_pattern_weights() (captures, saving a chain in
+        atari, MoGo shapes) and compete with a random move of weight RANDOM_WEIGHT, which
+        is drawn by random_legal_point(). True-eye-like points are never chosen.
+        :param rng: random.Random.
+        :param excluded: Optional set of flat points never played.
+        :return: Flat point index, or None if there is no move.
+        """
+        color = self.current_player
+        log = self.move_log
+        last = log.move(len(log) - 1)[0] if len(log) else None
+        if last is not None:
+            self.refresh_patterns()
+            board = self.board
+            patterns = self.patterns
+            weights = get_pattern_weights(color)
+            candidates = []
+            total = RANDOM_WEIGHT
+            for q in self.grid.neighbors[last] + self.grid.diagonals[last]:
+                if board[q] == EMPTY and (excluded is None or q not in excluded):
+                    weight = weights[patterns[q]]
+                    if weight > 1 and not self.is_true_eye_like(q, color) and self.is_legal_point(q):
+                        candidates.append((weight, q))
+                        total += weight
+            if candidates:
+                pick = rng.random() * total
+                for weight, q in candidates:
+                    pick -= weight
+                    if pick < 0:
+                        return q
+        return self.random_legal_point(rng, excluded, fill_eyes=False)
+
+    def playout(self, rng, max_moves=None, excluded=None, weighted=False):
+        """
+        Play random legal moves for both players on this game (use a clone to keep the
+        position), never filling true-eye-like points. A player with no such move
+        passes, and the playout stops as soon as neither player has one, which leaves
+        a position that calculate_scores() counts correctly.
+        :param rng: random.Random.
+        :param max_moves: Move limit, by default three moves per point.
+        :param excluded: Optional set of flat points never played (e.g. settled regions).
+        :param weighted: True to pick moves with pattern_playout_point() instead of uniformly.
+        :return: Generator of the flat points played, None for a pass.
+        """
+        if max_moves is None:
+            max_moves = 3 * self.board_size * self.board_size
+        passes = 0
+        for _ in range(max_moves):
+            if weighted:
+                point = self.pattern_playout_point(rng, excluded)
+            else:
+                point = self.random_legal_point(rng, excluded, fill_eyes=False)
+            if point is None:
+                passes += 1
+                if passes == 2:
+                    return
+                self.pass_turn()
+            else:
+                passes = 0
+                self.play_point(point)
+            yield point
+
+    def random_legal_move(self, rng):
+        """
+        Draw a uniformly random legal move for the current player.
+        :param rng: random.Random.
+        :return: (row, col) position, or None if no move is legal.
+        """
+        point = self.random_legal_point(rng)
+        return None if point is None else self.grid.row_col(point)
+
+    def is_suicide(self, row, col):
+        """
+        Check if placing a stone for the current player is a suicide move.
+        The move is legal if it has an empty neighbor, connects to a friendly chain with
+        another liberty, or captures an opponent chain; only the neighbors are inspected.
+        :param row: Row index.
+        :param col: Column index.
+        :return: True if suicide, False otherwise.
+        """
+        color = self.current_player
+        for q in self.grid.neighbors[self.grid.point(row, col)]:
+            chain = self.chains[q]
+            if chain is None:
+                if self.board[q] == EMPTY:
+                    return False
+            elif chain.color == color:
+                if len(chain.liberties) > 1:
+                    return False
+            elif chain.in_atari():
+                return False
+        return True
+
+    def capture_stones(self, row, col):
+        """
+        Capture opponent stones with no liberties.
+        :param row: Row index.
+        :param col: Column index.
+        :return: List of captured positions.
+        """
+        point = self.grid.point(row, col)
+        opponent = -self.board[point]
+        captured_positions = []
+
+        for q in self.grid.neighbors[point]:
+            chain = self.chains[q]
+            if chain is not None and chain.color == opponent and chain.is_captured():
+                captured_positions.extend(self.grid.row_col(p) for p in self.remove_chain(chain))
+                # Update captured stones count
+                self.captured_stones[-opponent] += len(chain)
+                logger.debug("Captured stones updated: %s", self.captured_stones)
+
+        return captured_positions
+
+
+    def count_liberties(self, row, col, visited):
+        """
+        Count liberties for a group of stones, read from its chain.
+        :param row: Row index.
+        :param col: Column index.
+        :param visited: Set of visited positions, filled with the stones of the group.
+        :return: Number of liberties.
+        """
+        chain = self.get_chain(row, col)
+        if chain is None or (row, col) in visited:
+            return 0
+        visited.update(self.grid.row_col(p) for p in chain.stones)
+        return len(chain.liberties)
+
+    def has_liberty(self, row, col):
+        """
+        Check if the group at a position has at least one liberty.
+        :param row: Row index.
+        :param col: Column index.
+        :return: True if the group has a liberty, False if it has none or the point is empty.
+        """
+        chain = self.get_chain(row, col)
+        return chain is not None and not chain.is_captured()
+
+    def get_neighbors(self, row, col):
+        """
+        Get the neighbors of a position.
+        :param row: Row index.
+        :param col: Column index.
+        :return: List of (row, col) neighbors.
+        """
+        neighbors = []
+        if row > 0:
+            neighbors.append((row - 1, col))
+        if row < self.board_size - 1:
+            neighbors.append((row + 1, col))
+        if col > 0:
+            neighbors.append((row, col - 1))
+        if col < self.board_size - 1:
+            neighbors.append((row, col + 1))
+        return neighbors
+
+    def pass_turn(self):
+        """
+        Pass the current player's turn.
+        """
+        self.pass_count += 1
+        self.current_player *= -1
+
+    def is_game_over(self):
+        """
+        Check if the game is over (two consecutive passes).
+        :return: True if game over, False otherwise.
+        """
+        return self.pass_count >= 2
+
+    def calculate_scores(self, final=False):
+        """
+        Calculate the scores for both players, by area or by territory depending on the rules.
+        Territory is kept up to date by update_regions(), which only re-explores the
+        empty regions changed since the last call.
+        :param final: True at the end of the game: the vital regions of unconditionally
+                      alive chains (see pass_alive()) go to their owner, the opponent
+                      stones inside them are scored as dead, and under territory scoring
+                      the eyes of chains in seki (see find_seki()) are not counted.
+        :return: Dictionary with scores for black and white.
+        """
+        logger.debug("Calculating scores...")
+        self.update_regions()
+        territories = dict(self.territory)
+        dead = self.settle_regions(territories) if final else {1: 0, -1: 0}
+
+        if self.rules.scoring == AREA:
+            # Add the stones on the board and komi
+            territories[1] += self.board.count(BLACK) - dead[1]  # Black's score
+            territories[-1] += self.board.count(WHITE) - dead[-1] + self.komi  # White's score with komi
+        else:
+            # Add captured stones and komi
+            territories[1] += self.captured_stones.get(1, 0) + dead[-1]  # Black's score
+            territories[-1] += self.captured_stones.get(-1, 0) + dead[1] + self.komi  # White's score with komi
+
+        logger.debug("Scores calculated: %s", territories)
+        return {"black": territories[1], "white": territories[-1]}
+
+    def settle_regions(self, territories):
+        """
+        Give the vital regions of each color's unconditionally alive chains to that color
+        and, under territory scoring, take the eyes of chains in seki out of the territory.
+        :param territories: Territory counts per color (as in self.territory), updated in place.
+        :return: Dictionary with the number of dead stones of each color.
+        """
+        board = self.board
+        region_of = self.region_of
+        dead = {1: 0, -1: 0}
+        for color in (BLACK, WHITE):
+            for p in self.pass_alive(color).regions:
+                value = board[p]
+                if value == EMPTY:
+                    owner = region_of[p][1]
+                    if owner != color:
+                        if owner:
+                            territories[owner] -= 1
+                        territories[color] += 1
+                else:
+                    dead[value] += 1
+                    territories[color] += 1
+        if self.rules.scoring != AREA:
+            for p in self.find_seki().eyes:
+                territories[region_of[p][1]] -= 1
+        return dead
+
+    def self_atari(self, point, color):
+        """
+        Check if a stone of the given color at an empty point would capture nothing and
+        leave its chain with at most one liberty. Only the neighboring chains are read.
+        :param point: Flat point index.
+        :param color: 1 for Black, -1 for White.
+        :return: True if the move puts its own chain in atari (or is suicide).
+        """
+        board = self.board
+        chains = self.chains
+        liberties = set()
+        for q in self.grid.neighbors[point]:
+            value = board[q]
+            if value == EMPTY:
+                liberties.add(q)
+            elif value == color:
+                liberties |= chains[q].liberties
+            elif value != BORDER and chains[q].in_atari():
+                return False
+        liberties.discard(point)
+        return len(liberties) <= 1
+
+    def find_seki(self):
+        """
+        Find the chains in seki and the dame with a local analysis of the neutral points.
+        A neutral point next to both colors is a shared liberty when playing it is
+        self-atari for both of them.
+        Chains touching shared liberties are in seki when every liberty they have is a
+        shared liberty or an eye (an empty region of their own color of at most
+        MAX_EYE_SIZE points); shared liberties next to a chain that is not in seki are
+        dropped, and the check is repeated until nothing changes.
+        :return: Seki of flat point sets.
+        """
+        self.update_regions()
+        board = self.board
+        chains = self.chains
+        neighbors = self.grid.neighbors
+        region_of = self.region_of
+        dame = set()
+        shared = set()
+        for p in self.grid.points:
+            if board[p] == EMPTY and not region_of[p][1]:
+                dame.add(p)
+                around = {board[q] for q in neighbors[p]}
+                if BLACK in around and WHITE in around and self.self_atari(p, BLACK) and self.self_atari(p, WHITE):
+                    shared.add(p)
+
+        while True:
+            candidates = {chains[q] for p in shared for q in neighbors[p] if chains[q] is not None}
+            failed = {chain for chain in candidates if not self.has_seki_liberties(chain, shared)}
+            if not failed:
+                break
+            # Drop the shared liberties of chains that cannot be in seki and try again
+            shared = {p for p in shared if not any(chains[q] in failed for q in neighbors[p])}
+
+        stones = set()
+        eyes = set()
+        for chain in candidates:
+            stones |= chain.stones
+            eyes.update(p for p in chain.liberties if p not in shared)
+        return Seki(frozenset(stones), frozenset(shared), frozenset(eyes), frozenset(dame))
+
+    def pass_alive(self, color):
+        """
+        Find the chains of one color that are unconditionally alive (Benson's algorithm):
+        they cannot be captured even if their owner always passes.
+        The board is split into regions of points not held by the color. A region is
+        vital to a bordering chain when all of its empty points are liberties of that
+        chain. Chains with fewer than two vital regions are dropped, then every region
+        bordering a dropped chain, until nothing changes.
+        :param color: 1 for Black, -1 for White.
+        :return: PassAlive of the alive stones and of their vital regions.
+        """
+        board = self.board
+        chains = self.chains
+        neighbors = self.grid.neighbors
+        visited = bytearray(self.grid.area)
+        regions = []  # (points, bordering chains, chains the region is vital to)
+        for p in self.grid.points:
+            if visited[p] or board[p] == color:
+                continue
+            points = []
+            empty = []
+            border = set()
+            visited[p] = 1
+            stack = [p]
+            while stack:
+                q = stack.pop()
+                points.append(q)
+                if board[q] == EMPTY:
+                    empty.append(q)
+                for r in neighbors[q]:
+                    value = board[r]
+                    if value == color:
+                        border.add(chains[r])
+                    elif value != BORDER and not visited[r]:
+                        visited[r] = 1
+                        stack.append(r)
+            vital = [chain for chain in border if all(e in chain.liberties for e in empty)]
+            regions.append((points, border, vital))
+
+        alive = {chain for chain in chains if chain is not None and chain.color == color}
+        while True:
+            vital_count = dict.fromkeys(alive, 0)
+            for _, _, vital in regions:
+                for chain in vital:
+                    if chain in vital_count:
+                        vital_count[chain] += 1
+            survivors = {chain for chain, count in vital_count.items() if count >= 2}
+            if len(survivors) == len(alive):
+                break
+            alive = survivors
+            regions = [region for region in regions if region[1] <= alive]
+
+        stones = set()
+        for chain in alive:
+            stones |= chain.stones
+        region_points = set()
+        for points, _, vital in regions:
+            if any(chain in alive for chain in vital):
+                region_points.update(points)
+        return PassAlive(frozenset(stones), frozenset(region_points))
+
+    def has_seki_liberties(self, chain, shared):
+        """
+        Check if every liberty of a chain is a shared liberty or one of its eyes.
+        :param chain: The chain to check.
+        :param shared: Set of shared liberty points.
+        :return: True if the chain can be in seki.
+        """
+        for p in chain.liberties:
+            if p not in shared:
+                points, owner = self.region_of[p]
+                if owner != chain.color or len(points) > MAX_EYE_SIZE:
+                    return False
+        return True
+
+    def update_regions(self):
+        """
+        Re-explore the empty regions touched by the points changed since the last update
+        (placed, captured or taken back stones) and adjust the territory counts.
+        """
+        dirty = self.dirty_points
+        if not dirty:
+            return
+        board = self.board
+        neighbors = self.grid.neighbors
+        region_of = self.region_of
+        territory = self.territory
+
+        # Drop every region that contains or borders a changed point
+        seeds = []
+        for d in dirty:
+            for p in (d,) + neighbors[d]:
+                region = region_of[p]
+                if region is not None:
+                    points, owner = region
+                    if owner:
+                        territory[owner] -= len(points)
+                    for q in points:
+                        region_of[q] = None
+                    seeds.extend(points)
+                elif board[p] == EMPTY:
+                    seeds.append(p)
+        dirty.clear()
+
+        # Explore the affected empty points again
+        visited = bytearray(self.grid.area)
+        for p in seeds:
+            if board[p] == EMPTY and not visited[p]:
+                points = []
+                size, owner = self.explore_territory(p, visited, points)
+                region = (points, owner)
+                for q in points:
+                    region_of[q] = region
+                if owner:
+                    territory[owner] += size
+
+    def explore_territory(self, point, visited, points=None):
+        """
+        Explore an empty region and determine ownership.
+        :param point: Flat point index of an empty point.
+        :param visited: bytearray of visited markers indexed by point, updated in place.
+        :param points: Optional list that collects the points of the region.
+        :return: (size, owner) tuple.
+        """
+        board = self.board
+        neighbors = self.grid.neighbors
+        stack = [point]
+        visited[point] = 1
+        territory = 0
+        black = white = False
+
+        while stack:
+            p = stack.pop()
+            territory += 1
+            if points is not None:
+                points.append(p)
+            for q in neighbors[p]:
+                value = board[q]
+                if value == EMPTY:
+                    if not visited[q]:
+                        visited[q] = 1
+                        stack.append(q)
+                elif value == BLACK:
+                    black = True
+                elif value == WHITE:
+                    white = True
+
+        owner = 0 if black == white else (BLACK if black else WHITE)
+        return territory, owner
+
+    def get_piece_at(self, row, col):
+        """
+        Get the state of the piece at a specific position.
+        :param row: Row index.
+        :param col: Column index.
+        :return: The state of the piece (0 for empty, 1 for Black, -1 for White).
+        """
+        if self.is_within_bounds(row, col):
+            return self.board[self.grid.point(row, col)]
+        return None
+
+    def is_within_bounds(self, row, col):
+        """
+        Check if a position is within the board boundaries.
+        :param row: Row index.
+        :param col: Column index.
+        :return: True if within bounds, False otherwise.
+        """
+        return 0 <= row < self.board_size and 0 <= col < self.board_size
+
+    def get_current_player(self):
+        """
+        Get the current player.
+        :return: 1 for Black, -1 for White.
+        """
+        return self.current_player
+
+    def pass_turn(self):
+        """
+        Pass the current player's turn. If both players pass consecutively, the game ends.
+        """
+        before = self.event_state() if self.listeners else None
+        color = self.current_player
+        ko_point = self.ko_point
+        self.ko_point = None
+        self.pass_count += 1
+        if self.pass_count < 2:
+            self.current_player *= -1  # Switch turns
+        self.record_move(None, color, ko_point)
+        if before is not None:
+            self.publish((), before)
+        # Both players passed consecutively: signal that the game should end
+        return self.pass_count >= 2
@@ -0,0 +1,111 @@
+from array import array
+
+# Values stored in a board array
+EMPTY = 0
+BLACK = 1
+WHITE = -1
+BORDER = 2  # sentinel around the playing area, never a valid move
+
+
+class Grid:
+    def __init__(self, board_size):
+        """
+        Describe a padded flat-array layout for a board of the given size.
+        The playing area is surrounded by a one-point BORDER frame, so every on-board
+        point has exactly four neighbor indices and no bounds checks are needed.
+        :param board_size: The size of the Go board (e.g., 9 for a 9x9 board).
+        """
+        self.board_size = board_size
+        self.width = board_size + 2
+        self.area = self.width * self.width
+        # On-board point indices in row-major order
+        self.points = [self.point(r, c) for r in range(board_size) for c in range(board_size)]
+        # Per-point tuples of the four orthogonal neighbors (built once, shared by all games)
+        self.neighbors = [()] * self.area
+        # Per-point tuples of the four diagonal neighbors (used to tell real eyes from false ones)
+        self.diagonals = [()] * self.area
+        width = self.width
+        for p in self.points:
+            self.neighbors[p] = (p - width, p + width, p - 1, p + 1)
+            self.diagonals[p] = (p - width - 1, p - width + 1, p + width - 1, p + width + 1)
+
+    def point(self, row, col):
+        """
+        Convert a (row, col) position to a flat point index.
+        """
+        return (row + 1) * self.width + col + 1
+
+    def row_col(self, point):
+        """
+        Convert a flat point index back to a (row, col) position.
+        """
+        row, col = divmod(point, self.width)
+        return row - 1, col - 1
+
+    def new_board(self):
+        """
+        Create an empty board array with the BORDER frame filled in.
+        :return: array('b') of length area.
+        """
+        board = array('b', [BORDER]) * self.area
+        for p in self.points:
+            board[p] = EMPTY
+        return board
+
+
+_grids = {}
+
+
+def get_grid(board_size):
+    """
+    Get the shared Grid for a board size, creating it on first use.
+    """
+    grid = _grids.get(board_size)
+    if grid is None:
+        grid = _grids[board_size] = Grid(board_size)
+    return grid
+
+
+class BoardRowView:
+    def __init__(self, board, offset, size):
+        """
+        Read-only view of one row of a flat board.
+        """
+        self.board = board
+        self.offset = offset
+        self.size = size
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.size:
+            raise IndexError("column out of range")
+        return self.board[self.offset + col]
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.board[self.offset:self.offset + self.size])
+
+
+class BoardView:
+    def __init__(self, board, grid):
+        """
+        Read-only nested-list style view over a flat board, so that view[row][col]
+        keeps working for code written against the old list-of-lists board_state.
+        :param board: Flat board array.
+        :param grid: Grid describing the layout of the array.
+        """
+        self.board = board
+        self.grid = grid
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.grid.board_size:
+            raise IndexError("row out of range")
+        return BoardRowView(self.board, self.grid.point(row, 0), self.grid.board_size)
+
+    def __len__(self):
+        return self.grid.board_size
+
+    def __iter__(self):
+        for row in range(self.grid.board_size):
+            yield self[row]
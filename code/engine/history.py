@@ -0,0 +1,269 @@
+from array import array
+
+
+class PositionHistory:
+    # Forks deeper than this copy their hashes into one layer to keep lookups short
+    MAX_DEPTH = 32
+
+    def __init__(self, base=None):
+        """
+        Initialize a history of position hashes for the superko rule.
+        Hashes are added and removed in stack order (moves and undos). They are kept in
+        one array, in the order they were added, and found through an open-addressing
+        table of indexes into that array, so a hash costs about 16 bytes instead of a
+        Python int in a set.
+        A history can be forked: the hashes recorded so far become a frozen base that
+        both sides share, and each side only stores the hashes added after the fork.
+        :param base: Frozen PositionHistory holding the earlier hashes, or None.
+        """
+        self.base = base
+        self.hashes = array("Q")  # Hashes added on top of the base, oldest first
+        self.table = array("I", bytes(4 * 8))  # Index + 1 into hashes per slot, 0 if free
+        self.depth = 0 if base is None else base.depth + 1
+        self.size = 0 if base is None else len(base)
+
+    def __contains__(self, position_hash):
+        history = self
+        while history is not None:
+            hashes = history.hashes
+            if hashes:
+                table = history.table
+                mask = len(table) - 1
+                slot = position_hash & mask
+                index = table[slot]
+                while index:
+                    if hashes[index - 1] == position_hash:
+                        return True
+                    slot = (slot + 1) & mask
+                    index = table[slot]
+            history = history.base
+        return False
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        layers = []
+        history = self
+        while history is not None:
+            layers.append(history.hashes)
+            history = history.base
+        for layer in reversed(layers):
+            yield from layer
+
+    def add(self, position_hash):
+        """
+        Record the hash of a new position.
+        """
+        hashes = self.hashes
+        hashes.append(position_hash)
+        if 2 * len(hashes) > len(self.table):
+            self.rebuild_table()
+        else:
+            self.insert(position_hash, len(hashes))
+        self.size += 1
+
+    def extend(self, hashes):
+        """
+        Record the hashes of several new positions at once, oldest first.
+        :param hashes: Iterable of hashes.
+        """
+        start = len(self.hashes)
+        self.hashes.extend(hashes)
+        added = len(self.hashes) - start
+        if 2 * len(self.hashes) > len(self.table):
+            self.rebuild_table()
+        else:
+            for index in range(start, len(self.hashes)):
+                self.insert(self.hashes[index], index + 1)
+        self.size += added
+
+    def insert(self, position_hash, index):
+        """
+        Put an index into the first free slot of the table from the slot of its hash.
+        :param position_hash: The hash at that index.
+        :param index: Index + 1 of the hash in self.hashes.
+        """
+        table = self.table
+        mask = len(table) - 1
+        slot = position_hash & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = index
+
+    def rebuild_table(self):
+        """
+        Size the table to at least twice the number of hashes and fill it again.
+        """
+        slots = 8
+        while slots < 2 * len(self.hashes):
+            slots *= 2
+        self.table = array("I", bytes(4 * slots))
+        for index, position_hash in enumerate(self.hashes, 1):
+            self.insert(position_hash, index)
+
+    def pop(self):
+        """
+        Remove and return the most recently recorded hash (used when a move is undone).
+        Freeing its slot is enough: it was the last one filled, so no other hash was
+        placed further along its probe sequence.
+        """
+        if not self.hashes:
+            if self.base is None:
+                raise IndexError("pop from an empty history")
+            self.flatten()
+        hashes = self.hashes
+        index = len(hashes)
+        position_hash = hashes.pop()
+        table = self.table
+        mask = len(table) - 1
+        slot = position_hash & mask
+        while table[slot] != index:
+            slot = (slot + 1) & mask
+        table[slot] = 0
+        self.size -= 1
+        return position_hash
+
+    def flatten(self):
+        """
+        Copy the hashes of every base layer into this one, so that it no longer depends on them.
+        """
+        self.hashes = array("Q", self)
+        self.base = None
+        self.depth = 0
+        self.rebuild_table()
+
+    def fork(self):
+        """
+        Split the history into two that share everything recorded so far.
+        This history must not be changed afterwards; use the two returned ones instead.
+        :return: (history for the original game, history for the copy).
+        """
+        if not self.hashes and self.base is not None:
+            base = self.base  # Nothing new since the last fork, share the same base
+        elif self.depth >= self.MAX_DEPTH:
+            base = PositionHistory()
+            base.hashes = array("Q", self)
+            base.rebuild_table()
+            base.size = len(base.hashes)
+        else:
+            base = self
+        return PositionHistory(base), PositionHistory(base)
+
+
+class MoveLog:
+    # A keyframe (snapshot of the position) is kept every this many moves
+    KEYFRAME_INTERVAL = 64
+
+    # Flag in a removed count marking stones removed by suicide (the mover's own stones)
+    SUICIDE = 1 << 15
+
+    def __init__(self, start):
+        """
+        Initialize a compact log of the moves of a game, which is also its undo history.
+        Each move takes six bytes (its flat point and color packed together, the ko point
+        before it and the number of stones it removed) plus two bytes per removed stone.
+        A snapshot of the position is kept every KEYFRAME_INTERVAL moves so that any
+        earlier position can be rebuilt by replaying at most that many moves (see
+        GoGame.position_at).
+        :param start: Position the log starts from (from GoGame.snapshot()).
+        """
+        self.moves = array("H")  # point << 1 | 1 for White; point 0 (a border point) is a pass
+        self.ko_points = array("H")  # Ko point before each move, 0 if there was none
+        self.removed_counts = array("H")  # Stones removed by each move, | SUICIDE for its own
+        self.removed = array("H")  # Points of the removed stones, move after move
+        self.keyframes = {0: start}  # Position after that many moves
+
+    def __len__(self):
+        return len(self.moves)
+
+    def append(self, point, color, ko_point=None, removed=(), suicide=False):
+        """
+        Record a move.
+        :param point: Flat point index, or None for a pass.
+        :param color: 1 for Black, -1 for White.
+        :param ko_point: Ko point before the move, or None.
+        :param removed: Points of the stones the move captured (or lost by suicide).
+        :param suicide: True if the removed stones are the mover's own.
+        """
+        self.moves.append((point or 0) << 1 | (color == -1))
+        self.ko_points.append(ko_point or 0)
+        if removed:
+            self.removed.extend(removed)
+            self.removed_counts.append(len(removed) | (self.SUICIDE if suicide else 0))
+        else:
+            self.removed_counts.append(0)
+
+    def pop(self):
+        """
+        Remove the last move (used when a move is undone), with its keyframe if it had one.
+        :return: (point or None for a pass, color, ko point before the move or None,
+                  list of removed points, True if they were removed by suicide).
+        """
+        self.keyframes.pop(len(self.moves), None)
+        point, color = self.move(len(self.moves) - 1)
+        self.moves.pop()
+        ko_point = self.ko_points.pop() or None
+        count = self.removed_counts.pop()
+        suicide = bool(count & self.SUICIDE)
+        count &= ~self.SUICIDE
+        removed = []
+        if count:
+            removed = self.removed[-count:].tolist()
+            del self.removed[-count:]
+        return point, color, ko_point, removed, suicide
+
+    def trailing_passes(self):
+        """
+        Count the passes at the end of the log, i.e. the pass count of the position.
+        """
+        moves = self.moves
+        count = 0
+        while count < len(moves) and moves[-1 - count] >> 1 == 0:
+            count += 1
+        return count
+
+    def move(self, index):
+        """
+        Read a move of the log.
+        :param index: Move number, from 0.
+        :return: (point or None for a pass, color).
+        """
+        packed = self.moves[index]
+        return (packed >> 1) or None, -1 if packed & 1 else 1
+
+    def needs_keyframe(self):
+        """
+        Check if the position after the last move should be stored as a keyframe.
+        """
+        count = len(self.moves)
+        return count % self.KEYFRAME_INTERVAL == 0 and count not in self.keyframes
+
+    def add_keyframe(self, position):
+        """
+        Store the position after the last move.
+        :param position: Position from GoGame.snapshot().
+        """
+        self.keyframes[len(self.moves)] = position
+
+    def keyframe_before(self, index):
+        """
+        Find the latest keyframe at or before a move number.
+        :return: (move number of the keyframe, Position).
+        """
+        start = index - index % self.KEYFRAME_INTERVAL
+        while start not in self.keyframes:
+            start -= self.KEYFRAME_INTERVAL
+        return start, self.keyframes[start]
+
+    def copy(self):
+        """
+        Copy the log; keyframes are immutable and shared.
+        """
+        other = MoveLog.__new__(MoveLog)
+        other.moves = array("H", self.moves)
+        other.ko_points = array("H", self.ko_points)
+        other.removed_counts = array("H", self.removed_counts)
+        other.removed = array("H", self.removed)
+        other.keyframes = dict(self.keyframes)
+        return other
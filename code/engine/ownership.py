@@ -0,0 +1,196 @@
+"""
+Monte Carlo estimate of who owns each point, used to find dead stones at the end of a game.
+Random playouts are run from the current position in a pool of worker processes.
+"""
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .grid import EMPTY, BLACK, WHITE
+from .game_logic import GoGame
+
+# Mean ownership against its color beyond which a chain is suggested dead
+DEAD_THRESHOLD = 0.5
+
+# Result of OwnershipEstimator: ownership rows of floats from -1 (White) to 1 (Black),
+# the (row, col) stones suggested dead, the playouts run and Black's share of wins
+Ownership = namedtuple("Ownership", "ownership dead playouts black_win_rate")
+
+
+def run_batch(position, board_size, komi, rules, excluded, count, seed, max_moves):
+    """
+    Run a batch of playouts from a position (worker process entry point).
+    :param position: Position from GoGame.snapshot().
+    :param excluded: Flat points the playouts never play.
+    :param count: Number of playouts.
+    :param seed: Seed of this batch.
+    :return: (count, owner sums per point in row-major order, Black wins).
+    """
+    rng = random.Random(seed)
+    base = GoGame(board_size, komi, rules)
+    base.restore(position)
+    points = base.grid.points
+    totals = [0] * len(points)
+    black_wins = 0
+    for _ in range(count):
+        game = base.clone()
+        for _ in game.playout(rng, max_moves, excluded):
+            pass
+        game.update_regions()
+        board = game.board
+        region_of = game.region_of
+        margin = 0
+        for i, p in enumerate(points):
+            value = board[p]
+            owner = value if value != EMPTY else region_of[p][1]
+            totals[i] += owner
+            margin += owner
+        if margin > komi:
+            black_wins += 1
+    return count, totals, black_wins
+
+
+class OwnershipEstimator:
+    def __init__(self, processes=None, batch_size=16, max_moves=None, dead_threshold=DEAD_THRESHOLD):
+        """
+        Initialize an estimator. The worker processes are started on first use and kept
+        until close(), so that repeated estimates do not pay the start-up cost.
+        :param processes: Number of worker processes (default: CPU count); 0 runs the
+                          playouts in the calling process.
+        :param batch_size: Playouts per task sent to a worker.
+        :param max_moves: Move limit per playout (default: 3 moves per point).
+        :param dead_threshold: See DEAD_THRESHOLD.
+        """
+        self.processes = (os.cpu_count() or 1) if processes is None else processes
+        self.batch_size = batch_size
+        self.max_moves = max_moves
+        self.dead_threshold = dead_threshold
+        self.executor = None
+
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def estimate(self, game, playouts=1000, time_limit=None, seed=None):
+        """
+        Estimate ownership within a playout and/or time budget.
+        :param game: GoGame to analyse (not changed).
+        :param playouts: Maximum number of playouts, or None for no limit.
+        :param time_limit: Maximum time in seconds, or None for no limit.
+        :param seed: Optional seed for reproducible results.
+        :return: Ownership (playouts is 0 if no batch finished in time).
+        """
+        result = None
+        for result in self.iter_estimates(game, playouts, time_limit, seed):
+            pass
+        return result if result is not None else self.summarize(game, {}, [0] * game.board_size ** 2, 0, 0)
+
+    def iter_estimates(self, game, playouts=1000, time_limit=None, seed=None):
+        """
+        Run playouts and yield the estimate so far each time a batch finishes, so that
+        a caller can show partial results or stop early.
+        :param game: GoGame to analyse (not changed).
+        :param playouts: Maximum number of playouts, or None for no limit.
+        :param time_limit: Maximum time in seconds, or None for no limit.
+        :param seed: Optional seed for reproducible results.
+        :return: Generator of Ownership.
+        :raises ValueError: If neither budget is given.
+        """
+        if playouts is None and time_limit is None:
+            raise ValueError("A playout or time budget is required.")
+        deadline = None if time_limit is None else time.monotonic() + time_limit
+        seed = random.randrange(1 << 30) if seed is None else seed
+
+        # Benson-settled points are fixed; playouts never play there
+        settled = {}
+        for color in (BLACK, WHITE):
+            alive = game.pass_alive(color)
+            for p in alive.stones | alive.regions:
+                settled[p] = color
+        max_moves = self.max_moves or 3 * game.board_size ** 2
+        task = (game.snapshot(), game.board_size, game.komi, game.rules, frozenset(settled))
+        if self.processes and self.executor is None:
+            self.executor = ProcessPoolExecutor(self.processes)
+        window = self.processes * 2 if self.processes else 1  # Batches in flight
+
+        totals = [0] * game.board_size ** 2
+        done = 0
+        black_wins = 0
+        started = 0
+        batches = 0
+        pending = set()
+        try:
+            while True:
+                # Keep a few batches ahead of the workers while the budgets allow
+                while (
+                    len(pending) < window
+                    and (playouts is None or started < playouts)
+                    and (deadline is None or time.monotonic() < deadline)
+                ):
+                    count = self.batch_size if playouts is None else min(self.batch_size, playouts - started)
+                    args = task + (count, seed + batches, max_moves)
+                    if self.executor is None:
+                        future = Future()
+                        future.set_result(run_batch(*args))
+                    else:
+                        future = self.executor.submit(run_batch, *args)
+                    pending.add(future)
+                    started += count
+                    batches += 1
+                if not pending:
+                    return
+
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                ready, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not ready:
+                    return  # Out of time
+                for future in ready:
+                    count, batch_totals, wins = future.result()
+                    done += count
+                    black_wins += wins
+                    for i, value in enumerate(batch_totals):
+                        totals[i] += value
+                yield self.summarize(game, settled, totals, done, black_wins)
+        finally:
+            for future in pending:
+                future.cancel()  # Batches already running finish in the background
+
+    def summarize(self, game, settled, totals, done, black_wins):
+        """
+        Turn the playout totals into an Ownership, settled points included.
+        :param game: The analysed GoGame.
+        :param settled: Dictionary of settled flat points to their owner.
+        :param totals: Owner sums per point in row-major order.
+        :param done: Number of playouts behind the totals.
+        :param black_wins: Number of those playouts won by Black.
+        :return: Ownership.
+        """
+        size = game.board_size
+        points = game.grid.points
+        values = [value / done if done else 0.0 for value in totals]
+        for i, p in enumerate(points):
+            if p in settled:
+                values[i] = float(settled[p])
+        ownership = tuple(tuple(values[r * size:(r + 1) * size]) for r in range(size))
+
+        dead = set()
+        index = {p: i for i, p in enumerate(points)}
+        row_col = game.grid.row_col
+        for chain in {chain for chain in game.chains if chain is not None}:
+            mean = sum(values[index[p]] for p in chain.stones) / len(chain.stones)
+            if done and mean * chain.color <= -self.dead_threshold:
+                dead.update(row_col(p) for p in chain.stones)
+        win_rate = black_wins / done if done else 0.5
+        return Ownership(ownership, frozenset(dead), done, win_rate)
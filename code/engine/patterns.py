@@ -0,0 +1,199 @@
+"""
+3x3 pattern codes of board points and the weight table of the pattern playout policy.
+
+The code of a point packs the 2-bit value (see VALUE_CODE) of each of its eight neighbors,
+in the order N, S, W, E, NW, NE, SW, SE, followed by one atari flag per orthogonal
+neighbor (set when the chain there has a single liberty). GoGame keeps the code of every
+point up to date as stones are added and removed (see GoGame.refresh_patterns).
+"""
+from .grid import BLACK, WHITE
+
+# 2-bit code of a board value, indexed by the value: empty 0, Black 1, border 3, White 2
+VALUE_CODE = (0, 1, 3, 2)
+
+# Bits of the neighbor values and of the atari flags
+COLOR_MASK = (1 << 16) - 1
+ATARI_BITS = (1 << 16, 1 << 17, 1 << 18, 1 << 19)
+
+# Index of the opposite direction, for N, S, W, E, NW, NE, SW, SE
+OPPOSITE = (1, 0, 3, 2, 7, 6, 5, 4)
+
+# Position of each direction in a 3x3 pattern read row by row (the center is 4)
+PATTERN_CELLS = (1, 7, 3, 5, 0, 2, 6, 8)
+
+# Weight of a point with no pattern, and of playing a random point instead of a pattern move
+BASE_WEIGHT = 1
+RANDOM_WEIGHT = 10
+
+# Weights for capturing an adjacent chain in atari and for extending one's own chain in atari
+CAPTURE_WEIGHT = 60
+SAVE_WEIGHT = 15
+
+# Playout patterns (after MoGo) centered on the move. X and O are the two colors, either
+# way round; x is anything but X, o anything but O, ? anything, and a space is off the board.
+PATTERN_TABLE = [
+    ("hane: enclosing", ("XOX", "...", "???"), 20),
+    ("hane: non-cutting", ("XO.", "...", "?.?"), 20),
+    ("hane: magari", ("XO?", "X..", "x.?"), 20),
+    ("diagonal attachment", (".O.", "X..", "..."), 10),
+    ("cut: unprotected", ("XO?", "O.o", "?o?"), 25),
+    ("cut: peeped", ("XO?", "O.X", "???"), 25),
+    ("cut: de", ("?X?", "O.O", "ooo"), 25),
+    ("cut: keima", ("OX?", "o.O", "???"), 20),
+    ("side: chase", ("X.?", "O.?", "   "), 10),
+    ("side: block cut", ("OX?", "X.O", "   "), 20),
+    ("side: block connection", ("?X?", "x.O", "   "), 10),
+    ("side: sagari", ("?XO", "x.x", "   "), 10),
+    ("side: cut", ("?OX", "X.O", "   "), 20),
+]
+
+
+_links = {}
+
+
+def get_pattern_links(grid):
+    """
+    For every on-board point, list the neighbors whose code includes it.
+    Built once per board size and shared between games.
+    :param grid: grid.Grid.
+    :return: List indexed by point of tuples of (neighbor, bit shift of the point in its code).
+    """
+    links = _links.get(grid.board_size)
+    if links is None:
+        on_board = set(grid.points)
+        links = [()] * grid.area
+        for p in grid.points:
+            around = grid.neighbors[p] + grid.diagonals[p]
+            links[p] = tuple(
+                (q, 2 * OPPOSITE[k]) for k, q in enumerate(around) if q in on_board
+            )
+        _links[grid.board_size] = links
+    return links
+
+
+def color_code(board, grid, point):
+    """
+    Compute the neighbor values part of the code of a point from the board.
+    """
+    code = 0
+    for k, q in enumerate(grid.neighbors[point] + grid.diagonals[point]):
+        code |= VALUE_CODE[board[q]] << 2 * k
+    return code
+
+
+_empty_patterns = {}
+
+
+def board_patterns(board, grid):
+    """
+    Compute the neighbor values part of the code of every point of a board: the codes
+    of the empty board (built once per board size) with each stone added through
+    the pattern links, so the cost is proportional to the stones.
+    :param board: Board array (see grid.Grid).
+    :param grid: grid.Grid.
+    :return: List indexed by point of codes, 0 off the board.
+    """
+    empty = _empty_patterns.get(grid.board_size)
+    if empty is None:
+        blank = grid.new_board()
+        empty = [0] * grid.area
+        for p in grid.points:
+            empty[p] = color_code(blank, grid, p)
+        _empty_patterns[grid.board_size] = empty
+    patterns = empty[:]
+    links = get_pattern_links(grid)
+    for p in grid.points:
+        value = board[p]
+        if value:
+            code = VALUE_CODE[value]
+            for q, shift in links[p]:
+                patterns[q] += code << shift
+    return patterns
+
+
+def transforms(rows):
+    """
+    List the 8 rotations and reflections of a 3x3 pattern, each as a 9-character string.
+    """
+    cells = "".join(rows)
+    results = []
+    for _ in range(4):
+        cells = "".join(cells[6 - 3 * c + r] for r in range(3) for c in range(3))  # Rotate
+        results.append(cells)
+        results.append("".join(cells[3 * r + 2 - c] for r in range(3) for c in range(3)))  # Mirror
+    return results
+
+
+def shape_weights(table):
+    """
+    Expand a pattern table into the neighbor value codes it matches, in every rotation,
+    reflection and color swap (X stands for Black, then for White).
+    :param table: Pattern table, as PATTERN_TABLE.
+    :return: Dictionary of neighbor value code to the largest weight of a matching pattern.
+    """
+    black, white, empty, edge = VALUE_CODE[BLACK], VALUE_CODE[WHITE], VALUE_CODE[0], VALUE_CODE[2]
+    weights = {}
+    for x, o in ((black, white), (white, black)):
+        values = {
+            "X": (x,), "O": (o,), ".": (empty,), " ": (edge,),
+            "x": (o, empty, edge), "o": (x, empty, edge), "?": (x, o, empty, edge),
+        }
+        for _, rows, weight in table:
+            for cells in transforms(rows):
+                codes = [0]
+                for k, index in enumerate(PATTERN_CELLS):
+                    codes = [code | value << 2 * k for code in codes for value in values[cells[index]]]
+                for code in codes:
+                    if weights.get(code, 0) < weight:
+                        weights[code] = weight
+    return weights
+
+
+class PatternWeights(dict):
+    def __init__(self, color, shapes):
+        """
+        Initialize the weights of pattern codes for one player to move. A code's weight is
+        computed the first time it is looked up and then read back from the dictionary.
+        :param color: Player to move, 1 for Black or -1 for White.
+        :param shapes: Dictionary from shape_weights().
+        """
+        super().__init__()
+        self.own = VALUE_CODE[color]
+        self.opponent = VALUE_CODE[-color]
+        self.shapes = shapes
+
+    def __missing__(self, code):
+        weight = self.shapes.get(code & COLOR_MASK, BASE_WEIGHT)
+        captures = saves = False
+        for k in range(4):
+            if code & ATARI_BITS[k]:
+                value = code >> 2 * k & 3
+                captures |= value == self.opponent
+                saves |= value == self.own
+        if captures:
+            weight *= CAPTURE_WEIGHT
+        elif saves:
+            weight *= SAVE_WEIGHT
+        self[code] = weight
+        return weight
+
+
+_weights = {}
+
+
+def get_pattern_weights(color):
+    """
+    Get the weight table of the pattern policy for one player to move. The shapes are
+    expanded from PATTERN_TABLE on the first call (about 16k codes), not at import,
+    and the tables are shared between games.
+    :param color: Player to move, 1 for Black or -1 for White.
+    :return: PatternWeights.
+    """
+    weights = _weights.get(color)
+    if weights is None:
+        if not _weights:
+            shapes = shape_weights(PATTERN_TABLE)
+            _weights[BLACK] = PatternWeights(BLACK, shapes)
+            _weights[WHITE] = PatternWeights(WHITE, shapes)
+        weights = _weights[color]
+    return weights
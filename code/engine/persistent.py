@@ -0,0 +1,105 @@
+from collections import namedtuple
+
+# Immutable record of a game position (see GoGame.snapshot and GoGame.restore)
+Position = namedtuple("Position", "board current_player ko_point captured_stones position_hash")
+
+
+class PersistentBoard:
+    __slots__ = ("board_size", "rows")
+
+    def __init__(self, board_size, rows=None):
+        """
+        Initialize an immutable board. Each row is a bytes object (one signed byte per
+        point: 0 empty, 1 Black, -1 White) and boards derived from this one share every
+        row they do not change, so a move costs one or a few new rows.
+        :param board_size: The size of the Go board.
+        :param rows: Tuple of board_size bytes rows, or None for an empty board.
+        """
+        self.board_size = board_size
+        self.rows = rows if rows is not None else (bytes(board_size),) * board_size
+
+    def get_piece_at(self, row, col):
+        """
+        Get the state of the piece at a specific position.
+        :return: 0 for empty, 1 for Black, -1 for White.
+        """
+        value = self.rows[row][col]
+        return value - 256 if value > 127 else value
+
+    def with_stones(self, changes):
+        """
+        Create a board with some points changed, sharing the untouched rows.
+        :param changes: Iterable of (row, col, value) with value 0, 1 or -1.
+        :return: New PersistentBoard.
+        """
+        rows = list(self.rows)
+        edited = {}
+        for row, col, value in changes:
+            line = edited.get(row)
+            if line is None:
+                line = edited[row] = bytearray(rows[row])
+            line[col] = value & 0xFF
+        for row, line in edited.items():
+            rows[row] = bytes(line)
+        return PersistentBoard(self.board_size, tuple(rows))
+
+    def with_rows(self, rows):
+        """
+        Create a board from new row contents, reusing this board's row objects where
+        they are equal so that unchanged rows stay shared.
+        :param rows: Sequence of board_size bytes rows.
+        :return: This board if nothing changed, otherwise a new PersistentBoard.
+        """
+        shared = tuple(old if old == new else new for old, new in zip(self.rows, rows))
+        if all(old is new for old, new in zip(self.rows, shared)):
+            return self
+        return PersistentBoard(self.board_size, shared)
+
+    def to_lists(self):
+        """
+        Convert the board to a list of rows of ints.
+        """
+        return [[self.get_piece_at(r, c) for c in range(self.board_size)] for r in range(self.board_size)]
+
+    def __eq__(self, other):
+        return isinstance(other, PersistentBoard) and self.rows == other.rows
+
+    def __hash__(self):
+        return hash(self.rows)
+
+
+class VariationNode:
+    __slots__ = ("move", "position", "parent", "children")
+
+    def __init__(self, move, position, parent=None):
+        """
+        Initialize a node of a variation tree.
+        :param move: (row, col) played to reach this node, None for a pass or the root.
+        :param position: Position after the move.
+        :param parent: Parent VariationNode, None for the root.
+        """
+        self.move = move
+        self.position = position
+        self.parent = parent
+        self.children = []
+
+    def add_child(self, move, position):
+        """
+        Add a variation after this node.
+        :return: The new child VariationNode.
+        """
+        child = VariationNode(move, position, self)
+        self.children.append(child)
+        return child
+
+    def path(self):
+        """
+        List the moves from the root to this node.
+        """
+        moves = []
+        node = self
+        while node.parent is not None:
+            moves.append(node.move)
+            node = node.parent
+        moves.reverse()
+        return moves
@@ -0,0 +1,90 @@
+
+class Piece:
+    def __init__(self, color, position):
+        """
+        Initialize a Piece with a color and position.
+        :param color: 1 for Black, -1 for White
+        :param position: Tuple (row, col)
+        """
+        self.color = color  # 1 for Black, -1 for White
+        self.position = position  # (row, col)
+        self.liberties = set()  # adjacent empty intersections
+        self.group = None  # reference to the group this piece belongs to
+
+    def set_liberties(self, liberties):
+        """
+        Set the liberties of this piece.
+        :param liberties: set of (row, col) positions
+        """
+        self.liberties = liberties
+
+    def remove_liberty(self, position):
+        """
+        Remove one liberty from the set.
+        """
+        if position in self.liberties:
+            self.liberties.remove(position)
+
+    def add_liberty(self, position):
+        """
+        Add one liberty to the set.
+        """
+        self.liberties.add(position)
+
+    def is_captured(self):
+        """
+        Determine if the piece has zero liberties.
+        """
+        return len(self.liberties) == 0
+
+    def __repr__(self):
+        color_str = "Black" if self.color == 1 else "White"
+        return f"Piece({color_str}, Position={self.position}, Liberties={len(self.liberties)})"
+
+class Chain:
+    def __init__(self, color, owner=None):
+        """
+        Initialize an empty chain (a group of orthogonally connected stones of one color).
+        :param color: 1 for Black, -1 for White
+        :param owner: token of the game allowed to modify the chain (see GoGame.clone)
+        """
+        self.color = color
+        self.owner = owner
+        self.stones = set()  # points of the stones in the chain
+        self.liberties = set()  # empty points adjacent to any stone of the chain
+
+    def copy(self, owner):
+        """
+        Create an independent copy of the chain for another owner.
+        """
+        chain = Chain(self.color, owner)
+        chain.stones = set(self.stones)
+        chain.liberties = set(self.liberties)
+        return chain
+
+    def merge(self, other):
+        """
+        Absorb the stones and liberties of another chain of the same color.
+        :param other: Chain to merge into this one.
+        """
+        self.stones |= other.stones
+        self.liberties |= other.liberties
+
+    def is_captured(self):
+        """
+        Determine if the chain has zero liberties.
+        """
+        return not self.liberties
+
+    def in_atari(self):
+        """
+        Determine if the chain has exactly one liberty left.
+        """
+        return len(self.liberties) == 1
+
+    def __len__(self):
+        return len(self.stones)
+
+    def __repr__(self):
+        color_str = "Black" if self.color == 1 else "White"
+        return f"Chain({color_str}, Stones={len(self.stones)}, Liberties={len(self.liberties)})"
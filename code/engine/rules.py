@@ -0,0 +1,47 @@
+from collections import namedtuple
+
+# Scoring methods
+AREA = "area"  # Stones on the board plus surrounded empty points (Chinese)
+TERRITORY = "territory"  # Surrounded empty points plus prisoners (Japanese)
+
+# Superko variants
+POSITIONAL = "positional"  # A board position may not be repeated
+SITUATIONAL = "situational"  # A board position may not be repeated with the same player to move
+
+# Rules a GoGame plays by; suicide is True if a move may remove its own chain (of two stones or more)
+RuleSet = namedtuple("RuleSet", "scoring superko suicide")
+
+JAPANESE = RuleSet(TERRITORY, POSITIONAL, False)
+CHINESE = RuleSet(AREA, POSITIONAL, False)
+AGA = RuleSet(AREA, SITUATIONAL, False)
+NEW_ZEALAND = RuleSet(AREA, SITUATIONAL, True)
+TROMP_TAYLOR = RuleSet(AREA, POSITIONAL, True)
+
+DEFAULT_RULES = JAPANESE
+
+RULE_SETS = {
+    "japanese": JAPANESE,
+    "chinese": CHINESE,
+    "aga": AGA,
+    "new zealand": NEW_ZEALAND,
+    "tromp-taylor": TROMP_TAYLOR,
+}
+
+
+def get_rules(rules):
+    """
+    Look up a rule set.
+    :param rules: A RuleSet, or the name of one of RULE_SETS (case-insensitive).
+    :return: RuleSet.
+    :raises ValueError: If the name or one of the settings is unknown.
+    """
+    if isinstance(rules, str):
+        try:
+            return RULE_SETS[rules.lower()]
+        except KeyError:
+            raise ValueError(f"Unknown rule set {rules!r}.") from None
+    if rules.scoring not in (AREA, TERRITORY):
+        raise ValueError(f"Unknown scoring {rules.scoring!r}.")
+    if rules.superko not in (POSITIONAL, SITUATIONAL):
+        raise ValueError(f"Unknown superko rule {rules.superko!r}.")
+    return rules
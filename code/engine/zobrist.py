@@ -0,0 +1,30 @@
+import random
+
+# Fixed seed so that hashes are identical across processes and runs.
+ZOBRIST_SEED = 0x60B0A4D
+
+_tables = {}
+
+
+def zobrist_table(board_size):
+    """
+    Get the Zobrist keys for a board of the given size.
+    Tables are generated once per size and shared between games.
+    :param board_size: The size of the Go board.
+    :return: Dictionary mapping a color (1 or -1) to a flat list of 64-bit keys,
+             indexed by the padded point index of grid.Grid.
+    """
+    table = _tables.get(board_size)
+    if table is None:
+        rng = random.Random(ZOBRIST_SEED + board_size)
+        points = (board_size + 2) * (board_size + 2)
+        table = {
+            1: [rng.getrandbits(64) for _ in range(points)],
+            -1: [rng.getrandbits(64) for _ in range(points)],
+        }
+        _tables[board_size] = table
+    return table
+
+
+# Mixed into the hashes of positions with White to move where the player to move matters (situational superko)
+WHITE_TO_MOVE_KEY = random.Random(ZOBRIST_SEED).getrandbits(64)
@@ -3,7 +3,8 @@ from PyQt6.QtCore import Qt
 from board import Board
 from main_menu import Menu
 from score_board import ScoreBoard
-from game_logic import GoGame
+from engine import GoGame
+from config import BOARD_SIZE
 
 
 class Go(QMainWindow):
@@ -48,10 +49,9 @@ class Go(QMainWindow):
         print("Starting the game...")
         if not self.board:
             print("Initializing Board and Game Logic...")
-            self.board = Board(parent=self, logic=GoGame(8))  # Initialize 7x7 board logic
+            self.board = Board(parent=self, logic=GoGame(BOARD_SIZE))  # Initialize board logic
             self.scoreBoard.make_connection(self.board)  # Link the board to the ScoreBoard
             self.scoreBoard.passTurnSignal.connect(self.board.pass_turn)  # Handle turn passing
-            self.scoreBoard.passTurnSignal.connect(self.scoreBoard.updateTurn)  # Update turn display
 
             # Add Board to ScoreBoard layout
             self.scoreBoard.mainLayout.addWidget(self.board)
@@ -78,7 +78,7 @@ class Go(QMainWindow):
     def endGame(self):
         """Handle the end-of-game scenario by calculating and displaying the scores."""
         print("Ending the game and calculating scores...")
-        scores = self.board.logic.calculate_scores()  # Fetch final scores
+        scores = self.board.logic.calculate_scores(final=True)  # Fetch final scores
         black_score = scores["black"]
         white_score = scores["white"]
 
@@ -10,7 +10,8 @@ from PyQt6.QtWidgets import (
     QGridLayout,
 )
 from board import Board
-from game_logic import GoGame
+from engine import GoGame, PlayerChanged
+from config import BOARD_SIZE
 from PyQt6.QtCore import pyqtSignal, pyqtSlot, Qt
 from PyQt6.QtWidgets import QDockWidget, QVBoxLayout, QLabel, QWidget, QSpacerItem, QSizePolicy, QPushButton, QHBoxLayout
 
@@ -30,8 +31,8 @@ class ScoreBoard(QDockWidget):
     
     def init_backend(self):
         """Initialize game logic."""
-        from game_logic import GoGame
-        self.game_logic = GoGame(8)  # Initialize game logic with a 7x7 board
+        from engine import GoGame
+        self.game_logic = GoGame(BOARD_SIZE)  # Initialize game logic with the configured board size
 
     def initUI(self):
         """Initialize ScoreBoard UI."""
@@ -113,6 +114,8 @@ class ScoreBoard(QDockWidget):
         board.updateScoresSignal.connect(self.updateScores)
         print("Connected: updateScoresSignal -> updateScores")
         board.updateCapturedStonesSignal.connect(self.updateCapturedStones)
+        board.logic.subscribe(self.applyChanges)
+        print("Subscribed: game logic changes -> applyChanges")
 
     @pyqtSlot(str)
     def setClickLocation(self, clickLoc):
@@ -132,24 +135,22 @@ class ScoreBoard(QDockWidget):
             scores = {'black': 0, 'white': 0}  # Ensure scores dictionary exists
         self.label_blackScore.setText(f"Black Score: {scores['black']}")
         self.label_whiteScore.setText(f"White Score: {scores['white']}")
-        self.updateTurn()
 
     def updateCapturedStones(self, captured_black, captured_white):
         """Update the captured stones in the UI."""
         print(f"Captured Stones updated: Black - {captured_black}, White - {captured_white}")  # Debug
 
-    def updateTurn(self):
-        """Update the turn label based on the current player."""
-        if self.connectedBoard:  # Ensure the board is connected
-            current_player = self.connectedBoard.logic.get_current_player()
-            player = "Black" if current_player == 1 else "White"
-            self.label_turn.setText(f"Turn: {player}")
+    def applyChanges(self, events):
+        """Follow the turn from the change events of the game logic."""
+        for event in events:
+            if isinstance(event, PlayerChanged):
+                player = "Black" if event.player == 1 else "White"
+                self.label_turn.setText(f"Turn: {player}")
 
     def skipTurn(self):
         """Handle the pass turn action."""
         print("Turn skipped.")  # Debug
         self.passTurnSignal.emit()  # Emit the signal to pass the turn
-        self.updateTurn()
 
     def resetGame(self):
         """Reset all scores and update the UI."""